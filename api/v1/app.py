@@ -1,6 +1,8 @@
 #!/usr/bin/python3
 """ Flask Application """
 from models import storage
+from api.v1.compression import enable_compression
+from api.v1.json_provider import HBNBJSONProvider
 from api.v1.views import app_views
 from os import environ
 from flask import Flask, render_template, make_response, jsonify
@@ -9,9 +11,10 @@ from flasgger import Swagger
 from flasgger.utils import swag_from
 
 app = Flask(__name__)
-app.config['JSONIFY_PRETTYPRINT_REGULAR'] = True
+app.json = HBNBJSONProvider(app)
 app.register_blueprint(app_views)
 CORS(app, resources={r"/api/v1/*": {"origins": "*"}})
+enable_compression(app)
 
 
 @app.teardown_appcontext
@@ -0,0 +1,205 @@
+#!/usr/bin/python3
+"""
+Contains the LRUCache and ResponseCache classes, caching the responses of
+the read endpoints until the storage saves an object they depend on
+"""
+from collections import OrderedDict
+from functools import wraps
+from models import storage
+from os import getenv
+import threading
+import time
+from uuid import uuid4
+from flask import current_app, g, make_response, request
+
+
+class LRUCache:
+    """
+    in-process cache backend keeping at most size values, each for ttl
+    seconds, evicting the least recently used first
+
+    Any object with the same get, set, clear and __len__ methods
+    can be given to ResponseCache as its backend instead.
+    """
+
+    def __init__(self, size=1024, ttl=60):
+        """creates an empty cache"""
+        self.__size = size
+        self.__ttl = ttl
+        self.__values = OrderedDict()
+        self.__lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        """returns the value of key, or None if missing or expired"""
+        with self.__lock:
+            entry = self.__values.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.__values[key]
+                return None
+            self.__values.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        """stores value under key, evicting the oldest values if full"""
+        with self.__lock:
+            self.__values[key] = (time.monotonic() + self.__ttl, value)
+            self.__values.move_to_end(key)
+            while len(self.__values) > self.__size:
+                self.__values.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """removes every key"""
+        with self.__lock:
+            self.__values.clear()
+
+    def __len__(self):
+        """returns the number of values held, expired ones included"""
+        return len(self.__values)
+
+
+class ResponseCache:
+    """
+    caches the responses of the views decorated by cached(), keyed by
+    path, query string and representation, and stops serving them once
+    the storage saves, deletes or reloads objects of the classes they
+    read
+
+    The version of each class is a random token kept in the backend
+    under "version <class name>" and replaced on each invalidation, so
+    that the processes sharing a backend see each other's invalidations;
+    a cached response keeps the tokens it was built under and is stale
+    once one of them changes, or is evicted. With the database storage,
+    which other processes write to without saving through this one, the
+    storage.version() of each class is part of the version as well.
+    """
+
+    def __init__(self, storage, backend=None, max_bytes=None):
+        """
+        subscribes to storage, caching in an LRUCache by default the
+        responses of at most max_bytes
+        """
+        if backend is None:
+            backend = LRUCache(int(getenv("HBNB_API_CACHE_SIZE", "1024")),
+                               float(getenv("HBNB_API_CACHE_TTL", "60")))
+        if max_bytes is None:
+            max_bytes = int(getenv("HBNB_API_CACHE_MAX_BYTES", "1048576"))
+        self.backend = backend
+        self.max_bytes = max_bytes
+        self.__storage = storage
+        self.__shared = getenv("HBNB_TYPE_STORAGE") == "db"
+        self.__lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        storage.subscribe(self.invalidate)
+
+    def invalidate(self, changes):
+        """
+        invalidates the responses reading the classes of the saved objects,
+        a dict of <class name>.id keys, or every response if changes is
+        None
+        """
+        with self.__lock:
+            self.invalidations += 1
+        if changes is None:
+            self.backend.clear()
+            return
+        for name in {key.split(".", 1)[0] for key in changes}:
+            self.backend.set("version " + name, uuid4().hex)
+
+    def __version(self, names):
+        """returns the tokens the responses reading names are built under"""
+        tokens = []
+        for name in names:
+            token = self.backend.get("version " + name)
+            if token is None:
+                token = uuid4().hex
+                self.backend.set("version " + name, token)
+            tokens.append(token)
+            if self.__shared:
+                tokens.append(self.__storage.version(name))
+        return tuple(tokens)
+
+    def __count(self, hit):
+        """counts a hit, or a miss"""
+        with self.__lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def __collect(self, key, version, chunks, headers):
+        """
+        yields the chunks of a streamed response, caching its body once
+        sent unless it's larger than max_bytes
+        """
+        body = []
+        size = 0
+        try:
+            for chunk in chunks:
+                yield chunk
+                if body is not None:
+                    size += len(chunk)
+                    body.append(chunk)
+                    if size > self.max_bytes:
+                        body = None
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+        if body is not None:
+            self.backend.set(key, (version, b"".join(body), 200, headers))
+
+    def cached(self, *classes):
+        """
+        decorates a view to serve its 200 responses from the cache until
+        objects of one of classes are saved
+        """
+        names = [cls.__name__ for cls in classes]
+
+        def decorator(view):
+            """wraps view"""
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                """serves the cached response or caches the view's"""
+                mimetype = request.accept_mimetypes.best_match(
+                    ['application/json', 'application/x-ndjson'])
+                key = "{} {}".format(request.full_path, mimetype)
+                version = self.__version(names)
+                entry = self.backend.get(key)
+                if entry is not None and entry[0] == version:
+                    self.__count(True)
+                    response = current_app.response_class(*entry[1:])
+                    return response.make_conditional(request)
+                self.__count(False)
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                if 'etag' in g:
+                    response.set_etag(g.etag)
+                headers = list(response.headers)
+                if response.is_streamed:
+                    response.response = self.__collect(
+                        key, version, response.iter_encoded(), headers)
+                elif len(response.get_data()) <= self.max_bytes:
+                    self.backend.set(key, (version, response.get_data(),
+                                           200, headers))
+                return response
+            return wrapper
+        return decorator
+
+    def stats(self):
+        """returns the hit, miss, invalidation and size metrics"""
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "evictions": getattr(self.backend, "evictions", 0),
+                "size": len(self.backend)}
+
+
+response_cache = ResponseCache(storage)
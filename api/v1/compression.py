@@ -0,0 +1,177 @@
+#!/usr/bin/python3
+"""
+gzip and brotli compression of the responses of a Flask app, negotiated
+with the Accept-Encoding header of the request
+"""
+import gzip
+import mimetypes
+import os
+import threading
+import zlib
+from flask import request, send_from_directory
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# the types worth compressing, images and archives being compressed already
+compressible = ('text/', 'application/json', 'application/x-ndjson',
+                'application/javascript', 'image/svg+xml')
+# the suffix of the precompressed variant of a static file by encoding
+suffixes = {'br': '.br', 'gzip': '.gz'}
+# static file path -> (stat of the file and its variants, encodings of the
+# variants holding its content), see fresh_encodings()
+fresh = {}
+fresh_lock = threading.Lock()
+
+
+def encodings():
+    """returns the encodings this process can compress to, best first"""
+    return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+
+def compressor(encoding):
+    """
+    returns the compress, flush and finish functions of a new streaming
+    compressor to encoding
+    """
+    if encoding == 'br':
+        brotli_compressor = brotli.Compressor(quality=5)
+        return (brotli_compressor.process, brotli_compressor.flush,
+                brotli_compressor.finish)
+    gzip_compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return (gzip_compressor.compress,
+            lambda: gzip_compressor.flush(zlib.Z_SYNC_FLUSH),
+            gzip_compressor.flush)
+
+
+def compress_chunks(chunks, encoding):
+    """
+    yields the compression of an iterable of strings, flushing after each
+    one so that streamed responses keep their time to first byte
+    """
+    compress, flush, finish = compressor(encoding)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            data = compress(chunk) + flush()
+            if data:
+                yield data
+        yield finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def compress_response(response, threshold):
+    """
+    compresses the body of response to the encoding the client prefers,
+    if it is of a compressible type and at least threshold bytes long
+    """
+    if (response.status_code < 200 or response.status_code in (204, 304) or
+            response.direct_passthrough or
+            'Content-Encoding' in response.headers or
+            not response.mimetype.startswith(compressible)):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = request.accept_encodings.best_match(encodings())
+    if encoding is None:
+        return response
+    if response.is_streamed:
+        response.response = compress_chunks(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < threshold:
+            return response
+        response.set_data(b''.join(compress_chunks([data], encoding)))
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag is not None:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def enable_compression(app, threshold=500):
+    """
+    compresses the responses of app of at least threshold bytes, and all
+    its streamed ones, whose size is not known in advance
+    """
+    @app.after_request
+    def compress(response):
+        """compresses the response if worth it"""
+        return compress_response(response, threshold)
+
+
+def decompress(encoding, data):
+    """returns data decompressed from encoding, None if not possible"""
+    if encoding == 'gzip':
+        return gzip.decompress(data)
+    if encoding == 'br' and brotli is not None:
+        return brotli.decompress(data)
+    return None
+
+
+def fresh_encodings(path):
+    """
+    returns the encodings of the precompressed variants of the file path
+    that decompress to its content; modification times telling nothing
+    after a checkout, the contents are compared, again only once the
+    file or one of its variants changes
+    """
+    stamps = []
+    for suffix in [''] + list(suffixes.values()):
+        try:
+            st = os.stat(path + suffix)
+            stamps.append((st.st_ino, st.st_size, st.st_mtime_ns))
+        except OSError:
+            stamps.append(None)
+    with fresh_lock:
+        entry = fresh.get(path)
+    if entry is not None and entry[0] == stamps:
+        return entry[1]
+    with open(path, 'rb') as f:
+        data = f.read()
+    available = []
+    for encoding, suffix in suffixes.items():
+        if os.path.isfile(path + suffix):
+            with open(path + suffix, 'rb') as f:
+                try:
+                    same = decompress(encoding, f.read()) == data
+                except Exception:
+                    same = False
+            if same:
+                available.append(encoding)
+    with fresh_lock:
+        fresh[path] = (stamps, available)
+    return available
+
+
+def serve_precompressed(app):
+    """
+    serves the static files of app from their .br or .gz variant, made by
+    web_dynamic/compress_static.py at deploy time, when the client
+    accepts it and it holds the current content of the file
+    """
+    static = app.view_functions['static']
+
+    def static_view(filename):
+        """sends the best precompressed variant of filename, if any"""
+        path = safe_join(app.static_folder, filename)
+        available = []
+        if path is not None and os.path.isfile(path):
+            available = fresh_encodings(path)
+        encoding = request.accept_encodings.best_match(available)
+        if encoding is None:
+            return static(filename=filename)
+        response = send_from_directory(
+            app.static_folder, filename + suffixes[encoding],
+            mimetype=mimetypes.guess_type(filename)[0])
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+
+    app.view_functions['static'] = static_view
@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+""" JSON provider of the API, compact unless asked for with ?pretty=1 """
+from datetime import datetime
+import json
+from flask import request, has_request_context
+from flask.json.provider import DefaultJSONProvider
+from models.base_model import format_time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def default(obj):
+    """serializes the values JSON does not know, datetimes as models do"""
+    if isinstance(obj, datetime):
+        return format_time(obj)
+    return DefaultJSONProvider.default(obj)
+
+
+class HBNBJSONProvider(DefaultJSONProvider):
+    """
+    writes compact JSON with sorted keys, with orjson when it is installed
+    and the standard json module otherwise, and indented JSON when the
+    request has the pretty=1 argument
+    """
+
+    def pretty(self):
+        """returns True if the current request asks for indented JSON"""
+        return has_request_context() and request.args.get('pretty') == '1'
+
+    def dumps(self, obj, pretty=False, **kwargs):
+        """serializes obj to a JSON string, indented if pretty"""
+        if kwargs:
+            kwargs.setdefault('default', default)
+            return json.dumps(obj, **kwargs)
+        if orjson is not None:
+            option = orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            if pretty:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=default, option=option).decode()
+        if pretty:
+            return json.dumps(obj, default=default, ensure_ascii=False,
+                              sort_keys=True, indent=2)
+        return json.dumps(obj, default=default, ensure_ascii=False,
+                          sort_keys=True, separators=(',', ':'))
+
+    def response(self, *args, **kwargs):
+        """returns a JSON response of the arguments, as jsonify does"""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            self.dumps(obj, self.pretty()) + '\n', mimetype=self.mimetype)
@@ -12,3 +12,4 @@ from api.v1.views.cities import *
 from api.v1.views.amenities import *
 from api.v1.views.users import *
 from api.v1.views.places_amenities import *
+from api.v1.views.batch import *
@@ -2,22 +2,25 @@
 """ objects that handles all default RestFul API actions for Amenities"""
 from models.amenity import Amenity
 from models import storage
+from api.v1.cache import response_cache
 from api.v1.views import app_views
+from api.v1.views.etags import not_modified, object_parts
+from api.v1.views.pagination import page_of, page_response
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
 
 
 @app_views.route('/amenities', methods=['GET'], strict_slashes=False)
 @swag_from('documentation/amenity/all_amenities.yml')
+@response_cache.cached(Amenity)
 def get_amenities():
     """
     Retrieves a list of all amenities
     """
-    all_amenities = storage.all(Amenity).values()
-    list_amenities = []
-    for amenity in all_amenities:
-        list_amenities.append(amenity.to_dict())
-    return jsonify(list_amenities)
+    if not_modified(storage.version(Amenity)):
+        return make_response('', 304)
+
+    return page_response(page_of(Amenity))
 
 
 @app_views.route('/amenities/<amenity_id>/', methods=['GET'],
@@ -29,6 +32,9 @@ def get_amenity(amenity_id):
     if not amenity:
         abort(404)
 
+    if not_modified(*object_parts(amenity)):
+        return make_response('', 304)
+
     return jsonify(amenity.to_dict())
 
 
@@ -90,5 +96,5 @@ def put_amenity(amenity_id):
     for key, value in data.items():
         if key not in ignore:
             setattr(amenity, key, value)
-    storage.save()
+    amenity.save()
     return make_response(jsonify(amenity.to_dict()), 200)
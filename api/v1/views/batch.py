@@ -0,0 +1,118 @@
+#!/usr/bin/python3
+""" objects that handle the batch create, update and delete actions """
+from datetime import datetime
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+from models import storage
+from api.v1.views import app_views
+from flask import abort, jsonify, make_response, request
+from flasgger.utils import swag_from
+
+# for each collection: its class, the attributes a create requires (the
+# ones referring to other objects mapped to their class), and the
+# attributes an update leaves untouched
+rules = {
+    'amenities': (Amenity, {'name': None},
+                  ['id', 'created_at', 'updated_at']),
+    'cities': (City, {'state_id': State, 'name': None},
+               ['id', 'state_id', 'created_at', 'updated_at']),
+    'places': (Place, {'city_id': City, 'user_id': User, 'name': None},
+               ['id', 'user_id', 'city_id', 'created_at', 'updated_at']),
+    'reviews': (Review, {'place_id': Place, 'user_id': User, 'text': None},
+                ['id', 'user_id', 'place_id', 'created_at', 'updated_at']),
+    'states': (State, {'name': None},
+               ['id', 'created_at', 'updated_at']),
+    'users': (User, {'email': None, 'password': None},
+              ['id', 'email', 'created_at', 'updated_at'])
+}
+
+
+def create(cls, required, item):
+    """
+    checks and stores a new object, returning its result; its id and
+    dates are generated, never taken from item
+    """
+    for attr, ref in required.items():
+        if attr not in item:
+            return {'status': 400, 'error': "Missing {}".format(attr)}
+        if ref is not None and not storage.get(ref, item[attr]):
+            return {'status': 404, 'error': "Not found"}
+    instance = cls(**{key: value for key, value in item.items()
+                      if key not in ('id', 'created_at', 'updated_at')})
+    storage.new(instance)
+    return {'status': 201, 'object': instance}
+
+
+def update(cls, ignore, item):
+    """checks and changes an object, returning its result"""
+    instance = storage.get(cls, item.get('id'))
+    if not instance:
+        return {'status': 404, 'error': "Not found"}
+    for key, value in item.items():
+        if key not in ignore:
+            setattr(instance, key, value)
+    instance.updated_at = datetime.utcnow()
+    return {'status': 200, 'object': instance}
+
+
+def delete(cls, item):
+    """checks and deletes an object, returning its result"""
+    instance = storage.get(cls, item.get('id'))
+    if not instance:
+        return {'status': 404, 'error': "Not found"}
+    storage.delete(instance)
+    return {'status': 200}
+
+
+@app_views.route('/<collection>/batch', methods=['POST'],
+                 strict_slashes=False)
+@swag_from('documentation/batch/post_batch.yml', methods=['POST'])
+def batch(collection):
+    """
+    Creates, updates and deletes objects of a collection from a list of
+    operations, saving the valid ones at once, or none of them if the
+    save fails
+    """
+    if collection not in rules:
+        abort(404)
+
+    operations = request.get_json(silent=True)
+    if not isinstance(operations, list):
+        abort(400, description="Not a JSON list")
+
+    cls, required, ignore = rules[collection]
+    results = []
+    for operation in operations:
+        if not isinstance(operation, dict):
+            results.append({'status': 400, 'error': "Not a JSON"})
+            continue
+        action = operation.get('action')
+        item = operation.get('data', {})
+        if not isinstance(item, dict):
+            result = {'status': 400, 'error': "Not a JSON"}
+        elif action == 'create':
+            result = create(cls, required, item)
+        elif action == 'update':
+            result = update(cls, ignore, item)
+        elif action == 'delete':
+            result = delete(cls, item)
+        else:
+            result = {'status': 400, 'error': "Unknown action"}
+        results.append(result)
+    try:
+        storage.save()
+    except Exception:
+        storage.rollback()
+        results = [{'status': 500, 'error': "Not saved"}
+                   if result['status'] < 400 else result
+                   for result in results]
+        return make_response(jsonify(results), 500)
+
+    for result in results:
+        if 'object' in result:
+            result['object'] = result['object'].to_dict()
+    return make_response(jsonify(results), 200)
@@ -3,7 +3,10 @@
 from models.city import City
 from models.state import State
 from models import storage
+from api.v1.cache import response_cache
 from api.v1.views import app_views
+from api.v1.views.etags import not_modified, object_parts
+from api.v1.views.pagination import page_of, page_response
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
 
@@ -11,19 +14,20 @@ from flasgger.utils import swag_from
 @app_views.route('/states/<state_id>/cities', methods=['GET'],
                  strict_slashes=False)
 @swag_from('documentation/city/cities_by_state.yml', methods=['GET'])
+@response_cache.cached(State, City)
 def get_cities(state_id):
     """
     Retrieves the list of all cities objects
     of a specific State, or a specific city
     """
-    list_cities = []
     state = storage.get(State, state_id)
     if not state:
         abort(404)
-    for city in state.cities:
-        list_cities.append(city.to_dict())
 
-    return jsonify(list_cities)
+    if not_modified(storage.version(City)):
+        return make_response('', 304)
+
+    return page_response(page_of(City, 'state_id', state_id))
 
 
 @app_views.route('/cities/<city_id>/', methods=['GET'], strict_slashes=False)
@@ -35,6 +39,9 @@ def get_city(city_id):
     city = storage.get(City, city_id)
     if not city:
         abort(404)
+    if not_modified(*object_parts(city)):
+        return make_response('', 304)
+
     return jsonify(city.to_dict())
 
 
@@ -95,5 +102,5 @@ def put_city(city_id):
     for key, value in data.items():
         if key not in ignore:
             setattr(city, key, value)
-    storage.save()
+    city.save()
     return make_response(jsonify(city.to_dict()), 200)
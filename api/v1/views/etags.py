@@ -0,0 +1,35 @@
+#!/usr/bin/python3
+""" entity tags of the GET endpoints, answering 304 to repeat clients """
+from hashlib import md5
+from api.v1.views import app_views
+from api.v1.views.streaming import mimetypes
+from models import storage
+from flask import g, request
+
+
+def not_modified(*parts):
+    """
+    Tags the response with a hash of parts, of the URL and of the
+    representation asked for, and returns True if the client already
+    holds that tag
+    """
+    mimetype = request.accept_mimetypes.best_match(mimetypes, mimetypes[0])
+    tag = repr(parts + (request.full_path, mimetype))
+    g.etag = md5(tag.encode()).hexdigest()
+    return request.if_none_match.contains_weak(g.etag)
+
+
+def object_parts(obj):
+    """
+    returns the parts of the entity tag of a single object: its id and
+    the version of its class, updated_at holding whole seconds in MySQL
+    """
+    return obj.id, storage.version(obj.__class__)
+
+
+@app_views.after_request
+def set_etag(response):
+    """sets the ETag header of the responses tagged by not_modified"""
+    if 'etag' in g and response.status_code in (200, 304):
+        response.set_etag(g.etag)
+    return response
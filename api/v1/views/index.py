@@ -7,8 +7,10 @@ from models.review import Review
 from models.state import State
 from models.user import User
 from models import storage
+from api.v1.cache import response_cache
 from api.v1.views import app_views
-from flask import jsonify
+from api.v1.views.etags import not_modified
+from flask import abort, jsonify, make_response
 
 
 @app_views.route('/status', methods=['GET'], strict_slashes=False)
@@ -18,13 +20,32 @@ def status():
 
 
 @app_views.route('/stats', methods=['GET'], strict_slashes=False)
+@response_cache.cached(Amenity, City, Place, Review, State, User)
 def number_objects():
     """ Retrieves the number of each objects by type """
     classes = [Amenity, City, Place, Review, State, User]
     names = ["amenities", "cities", "places", "reviews", "states", "users"]
 
+    if not_modified(*[storage.version(cls) for cls in classes]):
+        return make_response('', 304)
+
+    counts = storage.counts(classes)
     num_objs = {}
     for i in range(len(classes)):
-        num_objs[names[i]] = storage.count(classes[i])
+        num_objs[names[i]] = counts[classes[i].__name__]
 
     return jsonify(num_objs)
+
+
+@app_views.route('/stats/cache', methods=['GET'], strict_slashes=False)
+def cache_stats():
+    """ Retrieves the hit and miss metrics of the response cache """
+    return jsonify(response_cache.stats())
+
+
+@app_views.route('/stats/pool', methods=['GET'], strict_slashes=False)
+def pool_stats():
+    """ Retrieves the connection pool statistics of the database storage """
+    if not hasattr(storage, 'pool_stats'):
+        abort(404)
+    return jsonify(storage.pool_stats())
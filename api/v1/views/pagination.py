@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+""" keyset pagination of the list endpoints, by limit and after """
+from bisect import bisect_right
+from api.v1.views.streaming import stream_list
+from models import storage
+from flask import abort, request
+from urllib.parse import urlencode
+
+
+def page_args():
+    """
+    Returns the limit and after query arguments of the request, None
+    when not given
+    """
+    limit = request.args.get('limit')
+    after = request.args.get('after')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            limit = 0
+        if limit < 1:
+            abort(400, description="Invalid limit")
+    return limit, after
+
+
+def page_of(cls, attr=None, value=None):
+    """
+    Retrieves the page of objects of cls asked by the request, whose
+    attribute attr equals value if attr is given
+    """
+    limit, after = page_args()
+    return storage.page(cls, limit, after, attr, value)
+
+
+def page_ids(ids):
+    """
+    Retrieves the page of a list of ids asked by the request, in id
+    order
+    """
+    limit, after = page_args()
+    if limit is None and after is None:
+        return ids
+    ids = sorted(ids)
+    start = 0 if after is None else bisect_right(ids, after)
+    end = None if limit is None else start + limit
+    return ids[start:end]
+
+
+def to_dict(obj):
+    """
+    returns the dictionary representation of obj, its datetimes being
+    left to the JSON provider
+    """
+    return obj.to_dict(raw_time=1)
+
+
+def page_response(objs, convert=to_dict):
+    """
+    Returns the streamed JSON list of the dicts of a page of objects,
+    made by convert, linking to the next page when the page is full
+    """
+    response = stream_list(objs, convert)
+    limit = page_args()[0]
+    if limit is not None and len(objs) == limit:
+        args = request.args.to_dict()
+        args['after'] = objs[-1].id
+        response.headers['Link'] = '<{}?{}>; rel="next"'.format(
+            request.base_url, urlencode(args))
+    return response
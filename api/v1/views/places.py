@@ -6,9 +6,21 @@ from models.place import Place
 from models.user import User
 from models.amenity import Amenity
 from models import storage
+from models.engine.place_index import PlaceIndex
 from api.v1.views import app_views
+from api.v1.views.etags import not_modified, object_parts
+from api.v1.views.pagination import page_args, page_ids, page_of
+from api.v1.views.pagination import page_response
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
+from os import environ
+
+# the database answers searches itself, and sees the writes of the other
+# processes; the file storage reloads on their writes, rebuilding the index
+if environ.get('HBNB_TYPE_STORAGE') == "db":
+    place_index = None
+else:
+    place_index = PlaceIndex(storage)
 
 
 @app_views.route('/cities/<city_id>/places', methods=['GET'],
@@ -23,9 +35,10 @@ def get_places(city_id):
     if not city:
         abort(404)
 
-    places = [place.to_dict() for place in city.places]
+    if not_modified(storage.version(Place)):
+        return make_response('', 304)
 
-    return jsonify(places)
+    return page_response(page_of(Place, 'city_id', city_id))
 
 
 @app_views.route('/places/<place_id>', methods=['GET'], strict_slashes=False)
@@ -38,6 +51,9 @@ def get_place(place_id):
     if not place:
         abort(404)
 
+    if not_modified(*object_parts(place)):
+        return make_response('', 304)
+
     return jsonify(place.to_dict())
 
 
@@ -113,10 +129,20 @@ def put_place(place_id):
     for key, value in data.items():
         if key not in ignore:
             setattr(place, key, value)
-    storage.save()
+    place.save()
     return make_response(jsonify(place.to_dict()), 200)
 
 
+def search_dict(place):
+    """
+    Returns the dictionary of a place found by places_search, without
+    its amenities
+    """
+    d = place.to_dict(raw_time=1)
+    d.pop('amenities', None)
+    return d
+
+
 @app_views.route('/places_search', methods=['POST'], strict_slashes=False)
 @swag_from('documentation/place/post_search.yml', methods=['POST'])
 def places_search():
@@ -139,42 +165,14 @@ def places_search():
             not states and
             not cities and
             not amenities):
-        places = storage.all(Place).values()
-        list_places = []
-        for place in places:
-            list_places.append(place.to_dict())
-        return jsonify(list_places)
-
-    list_places = []
-    if states:
-        states_obj = [storage.get(State, s_id) for s_id in states]
-        for state in states_obj:
-            if state:
-                for city in state.cities:
-                    if city:
-                        for place in city.places:
-                            list_places.append(place)
-
-    if cities:
-        city_obj = [storage.get(City, c_id) for c_id in cities]
-        for city in city_obj:
-            if city:
-                for place in city.places:
-                    if place not in list_places:
-                        list_places.append(place)
-
-    if amenities:
-        if not list_places:
-            list_places = storage.all(Place).values()
-        amenities_obj = [storage.get(Amenity, a_id) for a_id in amenities]
-        list_places = [place for place in list_places
-                       if all([am in place.amenities
-                               for am in amenities_obj])]
-
-    places = []
-    for p in list_places:
-        d = p.to_dict()
-        d.pop('amenities', None)
-        places.append(d)
-
-    return jsonify(places)
+        return page_response(page_of(Place))
+
+    if place_index is None:
+        limit, after = page_args()
+        list_places = storage.search_places(states, cities, amenities,
+                                            limit, after)
+    else:
+        found = place_index.search(states, cities, amenities)
+        list_places = storage.get_many(Place, page_ids(found))
+
+    return page_response(list_places, search_dict)
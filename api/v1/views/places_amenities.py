@@ -4,6 +4,7 @@ from models.place import Place
 from models.amenity import Amenity
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.etags import not_modified, object_parts
 from os import environ
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
@@ -22,6 +23,9 @@ def get_place_amenities(place_id):
     if not place:
         abort(404)
 
+    if not_modified(*object_parts(place), storage.version(Amenity)):
+        return make_response('', 304)
+
     if environ.get('HBNB_TYPE_STORAGE') == "db":
         amenities = [amenity.to_dict() for amenity in place.amenities]
     else:
@@ -56,9 +60,10 @@ def delete_place_amenity(place_id, amenity_id):
     else:
         if amenity_id not in place.amenity_ids:
             abort(404)
-        place.amenity_ids.remove(amenity_id)
+        place.amenity_ids = [a_id for a_id in place.amenity_ids
+                             if a_id != amenity_id]
 
-    storage.save()
+    place.save()
     return make_response(jsonify({}), 200)
 
 
@@ -89,7 +94,7 @@ def post_place_amenity(place_id, amenity_id):
         if amenity_id in place.amenity_ids:
             return make_response(jsonify(amenity.to_dict()), 200)
         else:
-            place.amenity_ids.append(amenity_id)
+            place.amenity_ids = place.amenity_ids + [amenity_id]
 
-    storage.save()
+    place.save()
     return make_response(jsonify(amenity.to_dict()), 201)
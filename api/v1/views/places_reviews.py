@@ -5,6 +5,8 @@ from models.place import Place
 from models.user import User
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.etags import not_modified, object_parts
+from api.v1.views.pagination import page_of, page_response
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
 
@@ -21,9 +23,10 @@ def get_reviews(place_id):
     if not place:
         abort(404)
 
-    reviews = [review.to_dict() for review in place.reviews]
+    if not_modified(storage.version(Review)):
+        return make_response('', 304)
 
-    return jsonify(reviews)
+    return page_response(page_of(Review, 'place_id', place_id))
 
 
 @app_views.route('/reviews/<review_id>', methods=['GET'], strict_slashes=False)
@@ -36,6 +39,9 @@ def get_review(review_id):
     if not review:
         abort(404)
 
+    if not_modified(*object_parts(review)):
+        return make_response('', 304)
+
     return jsonify(review.to_dict())
 
 
@@ -111,5 +117,5 @@ def put_review(review_id):
     for key, value in data.items():
         if key not in ignore:
             setattr(review, key, value)
-    storage.save()
+    review.save()
     return make_response(jsonify(review.to_dict()), 200)
@@ -2,22 +2,25 @@
 """ objects that handle all default RestFul API actions for States """
 from models.state import State
 from models import storage
+from api.v1.cache import response_cache
 from api.v1.views import app_views
+from api.v1.views.etags import not_modified, object_parts
+from api.v1.views.pagination import page_of, page_response
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
 
 
 @app_views.route('/states', methods=['GET'], strict_slashes=False)
 @swag_from('documentation/state/get_state.yml', methods=['GET'])
+@response_cache.cached(State)
 def get_states():
     """
     Retrieves the list of all State objects
     """
-    all_states = storage.all(State).values()
-    list_states = []
-    for state in all_states:
-        list_states.append(state.to_dict())
-    return jsonify(list_states)
+    if not_modified(storage.version(State)):
+        return make_response('', 304)
+
+    return page_response(page_of(State))
 
 
 @app_views.route('/states/<state_id>', methods=['GET'], strict_slashes=False)
@@ -28,6 +31,9 @@ def get_state(state_id):
     if not state:
         abort(404)
 
+    if not_modified(*object_parts(state)):
+        return make_response('', 304)
+
     return jsonify(state.to_dict())
 
 
@@ -88,5 +94,5 @@ def put_state(state_id):
     for key, value in data.items():
         if key not in ignore:
             setattr(state, key, value)
-    storage.save()
+    state.save()
     return make_response(jsonify(state.to_dict()), 200)
@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+""" streamed JSON list responses, as a JSON array or NDJSON """
+from flask import current_app, request, Response, stream_with_context
+
+# size in characters above which the pending output is sent
+chunk_size = 16384
+mimetypes = ['application/json', 'application/x-ndjson']
+
+
+def stream_list(items, convert=None):
+    """
+    Returns a response streaming the JSON of each item (converted by
+    convert if given) as a JSON array, or as one JSON value per line
+    if the client prefers NDJSON
+    """
+    mimetype = request.accept_mimetypes.best_match(mimetypes, mimetypes[0])
+    pretty = False
+    if mimetype == 'application/x-ndjson':
+        start, separator, end = '', '', ''
+        suffix = '\n'
+    elif current_app.json.pretty():
+        start, separator, end = '[\n', ',\n', '\n]\n'
+        suffix = ''
+        pretty = True
+    else:
+        start, separator, end = '[', ',', ']\n'
+        suffix = ''
+    dumps = current_app.json.dumps
+
+    def generate():
+        """yields the list chunk by chunk, serializing items lazily"""
+        parts = [start]
+        size = 0
+        for i, item in enumerate(items):
+            if convert is not None:
+                item = convert(item)
+            if i:
+                parts.append(separator)
+            part = dumps(item, pretty)
+            parts.append(part + suffix)
+            size += len(part)
+            if size >= chunk_size:
+                yield ''.join(parts)
+                parts = []
+                size = 0
+        parts.append(end)
+        yield ''.join(parts)
+
+    return Response(stream_with_context(generate()), mimetype=mimetype)
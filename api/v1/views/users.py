@@ -3,6 +3,8 @@
 from models.user import User
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.etags import not_modified, object_parts
+from api.v1.views.pagination import page_of, page_response
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
 
@@ -14,11 +16,10 @@ def get_users():
     Retrieves the list of all user objects
     or a specific user
     """
-    all_users = storage.all(User).values()
-    list_users = []
-    for user in all_users:
-        list_users.append(user.to_dict())
-    return jsonify(list_users)
+    if not_modified(storage.version(User)):
+        return make_response('', 304)
+
+    return page_response(page_of(User))
 
 
 @app_views.route('/users/<user_id>', methods=['GET'], strict_slashes=False)
@@ -29,6 +30,9 @@ def get_user(user_id):
     if not user:
         abort(404)
 
+    if not_modified(*object_parts(user)):
+        return make_response('', 304)
+
     return jsonify(user.to_dict())
 
 
@@ -91,5 +95,5 @@ def put_user(user_id):
     for key, value in data.items():
         if key not in ignore:
             setattr(user, key, value)
-    storage.save()
+    user.save()
     return make_response(jsonify(user.to_dict()), 200)
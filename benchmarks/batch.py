@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+"""
+Measures creating places one POST at a time against one POST to
+/places/batch, in a temporary directory so that file.json is untouched
+
+usage: python3 -m benchmarks.batch [number of places]
+"""
+import os
+import sys
+import tempfile
+import time
+
+if __name__ == "__main__":
+    os.chdir(tempfile.mkdtemp())
+    from api.v1.app import app
+    from models.city import City
+    from models.state import State
+    from models.user import User
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    state = State(name="California")
+    state.save()
+    city = City(name="San Francisco", state_id=state.id)
+    city.save()
+    user = User(email="a@b.c", password="pwd")
+    user.save()
+    client = app.test_client()
+    data = [{"name": "Place {}".format(i), "user_id": user.id}
+            for i in range(n)]
+
+    start = time.perf_counter()
+    for item in data:
+        client.post('/api/v1/cities/{}/places'.format(city.id), json=item)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    client.post('/api/v1/places/batch',
+                json=[{"action": "create",
+                       "data": dict(item, city_id=city.id)}
+                      for item in data])
+    batch = time.perf_counter() - start
+
+    print("{} places: {:.2f} s one by one, {:.2f} s in a batch".format(
+        n, single, batch))
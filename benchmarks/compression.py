@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+"""
+Measures, for a list of places served by the API, the size and the
+server time of its response uncompressed and in each supported encoding,
+and the requests per second a link of the given bandwidth sustains
+
+usage: python3 -m benchmarks.compression [number of places] [Mbit/s]
+"""
+import sys
+import time
+from api.v1.app import app
+from api.v1.compression import encodings
+from models import storage
+from models.place import Place
+
+
+def measure(client, encoding, n=20):
+    """returns the response size and the mean seconds per request"""
+    headers = {'Accept-Encoding': encoding}
+    start = time.perf_counter()
+    for i in range(n):
+        response = client.post('/api/v1/places_search', json={},
+                               headers=headers)
+        size = len(response.get_data())
+    return size, (time.perf_counter() - start) / n
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    mbits = float(sys.argv[2]) if len(sys.argv) > 2 else 100
+    places = [Place(name="Place {}".format(i), city_id="c", user_id="u",
+                    description="A cosy place near the center, " * 8)
+              for i in range(n)]
+    for place in places:
+        storage.new(place)
+    client = app.test_client()
+    try:
+        for encoding in ['identity'] + encodings():
+            size, seconds = measure(client, encoding)
+            wire = size * 8 / (mbits * 1e6)
+            print("{:9s} {:10d} bytes {:8.2f} ms server {:8.1f} req/s at "
+                  "{:g} Mbit/s".format(encoding, size, seconds * 1e3,
+                                       1 / (seconds + wire), mbits))
+    finally:
+        for place in places:
+            storage.delete(place)
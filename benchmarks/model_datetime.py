@@ -0,0 +1,31 @@
+#!/usr/bin/python3
+"""
+Measures the per-object cost of building a model from a to_dict()
+dictionary and of serializing it back, and of the datetime conversions
+they make, against the strptime/strftime they replaced
+
+usage: python3 -m benchmarks.model_datetime [number of iterations]
+"""
+from datetime import datetime
+import sys
+import timeit
+from models.base_model import format_time, parse_time, time
+from models.review import Review
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    record = Review(place_id="p", user_id="u", text="Nice").to_dict()
+    review = Review(**record)
+    value = record["created_at"]
+    date = review.created_at
+    assert format_time(date) == date.strftime(time)
+    assert parse_time(value) == datetime.strptime(value, time)
+    cases = [("strptime", lambda: datetime.strptime(value, time)),
+             ("parse_time", lambda: parse_time(value)),
+             ("strftime", lambda: date.strftime(time)),
+             ("format_time", lambda: format_time(date)),
+             ("Review(**to_dict())", lambda: Review(**record)),
+             ("to_dict()", lambda: review.to_dict(save_fs=1))]
+    for name, case in cases:
+        usec = timeit.timeit(case, number=n) / n * 1e6
+        print("{:22s} {:8.3f} us".format(name, usec))
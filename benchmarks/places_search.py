@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Measures PlaceIndex.search() latency on a generated dataset, against
+the list-based filtering places_search used to do
+
+usage: python3 -m benchmarks.places_search [number of places]
+"""
+import random
+import sys
+import time
+from models.amenity import Amenity
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.engine.place_index import PlaceIndex
+from models.place import Place
+from models.state import State
+
+
+def legacy_search(storage, states, cities, amenities):
+    """the places_search filtering before it moved to PlaceIndex"""
+    places = []
+    for state in storage.get_many(State, states):
+        for city in state.cities:
+            places.extend(city.places)
+    for city in storage.get_many(City, cities):
+        for place in city.places:
+            if place not in places:
+                places.append(place)
+    if not places:
+        places = storage.all(Place).values()
+    wanted = storage.get_many(Amenity, amenities)
+    return [place for place in places
+            if all([am in place.amenities for am in wanted])]
+
+
+def timed(search, *args):
+    """returns (number of results, best milliseconds of 3) of a search"""
+    best = None
+    for i in range(3):
+        start = time.time()
+        found = search(*args)
+        elapsed = (time.time() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return len(found), best
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    random.seed(0)
+    storage = FileStorage()
+    FileStorage._FileStorage__objects = {}
+    states = [State(name="State {}".format(i)) for i in range(50)]
+    cities = [City(name="City {}".format(i), state_id=states[i % 50].id)
+              for i in range(1000)]
+    amenities = [Amenity(name="Amenity {}".format(i)) for i in range(50)]
+    for obj in states + cities + amenities:
+        storage.new(obj)
+    for i in range(n):
+        storage.new(Place(name="Place {}".format(i),
+                          city_id=random.choice(cities).id,
+                          amenity_ids=[a.id for a in
+                                       random.sample(amenities, 5)]))
+    queries = [("5 states", [s.id for s in states[:5]], [], []),
+               ("20 cities", [], [c.id for c in cities[:20]], []),
+               ("1 amenity", [], [], [amenities[0].id]),
+               ("3 amenities", [], [], [a.id for a in amenities[:3]]),
+               ("5 states, 2 amenities", [s.id for s in states[:5]], [],
+                [a.id for a in amenities[:2]])]
+    index = PlaceIndex(storage)
+    index.search()
+    print("{} places, times in ms for PlaceIndex, legacy".format(n))
+    for name, *args in queries:
+        count, bitmap = timed(index.search, *args)
+        _, old = timed(legacy_search, storage, *args)
+        print("{:24s} {:6d} results {:9.3f} {:9.2f}"
+              .format(name, count, bitmap, old))
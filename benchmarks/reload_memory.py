@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""
+Measures the time and peak RSS of FileStorage.reload() for each format
+
+usage: python3 -m benchmarks.reload_memory [number of objects]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOADER = """
+import resource, time
+start = time.time()
+from models import storage
+elapsed = time.time() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(storage.count(), elapsed, peak)
+"""
+
+
+def records(n):
+    """yields n Review dictionaries as FileStorage writes them"""
+    for i in range(n):
+        yield {"id": str(uuid.uuid4()), "__class__": "Review",
+               "created_at": "2017-03-25T02:17:06.000000",
+               "updated_at": "2017-03-25T02:17:06.000000",
+               "place_id": str(uuid.uuid4()), "user_id": str(uuid.uuid4()),
+               "text": "Review number {}".format(i)}
+
+
+def write(path, fmt, n):
+    """writes n records to path in the given storage format"""
+    with open(path, "w") as f:
+        if fmt == "jsonl":
+            for record in records(n):
+                f.write(json.dumps(record) + "\n")
+            return
+        f.write("{")
+        for i, record in enumerate(records(n)):
+            key = "Review." + record["id"]
+            f.write("{}{}: {}".format(", " if i else "", json.dumps(key),
+                                      json.dumps(record)))
+        f.write("}")
+
+
+def measure(fmt, n):
+    """returns (objects, seconds, peak RSS in MB) of a reload"""
+    with tempfile.TemporaryDirectory() as tmp:
+        name = "file.jsonl" if fmt == "jsonl" else "file.json"
+        write(os.path.join(tmp, name), fmt, n)
+        env = dict(os.environ, PYTHONPATH=ROOT, HBNB_FILE_FORMAT=fmt)
+        env.pop("HBNB_TYPE_STORAGE", None)
+        out = subprocess.check_output([sys.executable, "-c", LOADER],
+                                      cwd=tmp, env=env)
+    count, elapsed, peak = out.split()
+    return int(count), float(elapsed), int(peak) / 1024
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    for fmt in ["json", "jsonl"]:
+        count, elapsed, peak = measure(fmt, n)
+        print("{:6s} {:>9d} objects  {:7.2f} s  {:8.1f} MB peak RSS"
+              .format(fmt, count, elapsed, peak))
@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+"""
+Measures the time to the first byte and the peak memory of a list
+response of places, built whole by jsonify or streamed by stream_list
+
+usage: python3 -m benchmarks.streaming [number of places]
+"""
+import sys
+import time
+import tracemalloc
+from api.v1.app import app
+from api.v1.views.streaming import stream_list
+from flask import jsonify
+from models.place import Place
+
+
+def jsonified(places):
+    """returns the response of the whole list, as the views did"""
+    return jsonify([place.to_dict() for place in places])
+
+
+def streamed(places):
+    """returns the streamed response of the list"""
+    return stream_list(places, Place.to_dict)
+
+
+def measure(respond, places):
+    """returns the seconds to the first chunk and the peak memory in MiB"""
+    with app.test_request_context():
+        tracemalloc.start()
+        start = time.perf_counter()
+        chunks = iter(respond(places).response)
+        next(chunks)
+        first = time.perf_counter() - start
+        for chunk in chunks:
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return first, peak / 2 ** 20
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    places = [Place(name="Place {}".format(i), city_id="c", user_id="u",
+                    description="x" * 200) for i in range(n)]
+    for name, respond in [("jsonify", jsonified), ("stream_list", streamed)]:
+        first, peak = measure(respond, places)
+        print("{:12s} first byte {:8.2f} ms  peak {:8.2f} MiB".format(
+            name, first * 1e3, peak))
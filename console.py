@@ -6,6 +6,7 @@ from datetime import datetime
 import models
 from models.amenity import Amenity
 from models.base_model import BaseModel
+from models.engine import bulk
 from models.city import City
 from models.place import Place
 from models.review import Review
@@ -96,7 +97,7 @@ class HBNBCommand(cmd.Cmd):
             if len(args) > 1:
                 key = args[0] + "." + args[1]
                 if key in models.storage.all():
-                    models.storage.all().pop(key)
+                    models.storage.delete(models.storage.all()[key])
                     models.storage.save()
                 else:
                     print("** no instance found **")
@@ -160,5 +161,60 @@ class HBNBCommand(cmd.Cmd):
         else:
             print("** class doesn't exist **")
 
+    def _bulk_args(self, arg):
+        """returns the path, format and class list of import and export"""
+        args = shlex.split(arg)
+        if len(args) == 0:
+            print("** file name missing **")
+            return None
+        fmt = "csv" if args[0].endswith(".csv") else "ndjson"
+        if len(args) > 1:
+            if args[1] not in bulk.classes:
+                print("** class doesn't exist **")
+                return None
+            return args[0], fmt, [bulk.classes[args[1]]]
+        if fmt == "csv":
+            print("** class name missing **")
+            return None
+        return args[0], fmt, None
+
+    def do_import(self, arg):
+        """Loads the objects of a NDJSON or CSV file (of one class)"""
+        args = self._bulk_args(arg)
+        if args is None:
+            return False
+        path, fmt, clss = args
+        cls = clss[0] if clss else None
+        try:
+            with open(path, newline="") as f:
+                count, seconds = bulk.load(bulk.read(f, fmt, cls))
+        except FileNotFoundError:
+            print("** file doesn't exist **")
+            return False
+        except OSError:
+            print("** can't read file **")
+            return False
+        except (AttributeError, KeyError, TypeError, ValueError):
+            models.storage.rollback()
+            print("** invalid record **")
+            return False
+        print("{} rows in {:.2f} s ({:.0f} rows/sec)".format(
+            count, seconds, count / seconds if seconds else 0))
+
+    def do_export(self, arg):
+        """Writes the objects (of a class) to a NDJSON or CSV file"""
+        args = self._bulk_args(arg)
+        if args is None:
+            return False
+        path, fmt, clss = args
+        try:
+            with open(path, "w", newline="") as f:
+                count, seconds = bulk.export(f, fmt, clss)
+        except OSError:
+            print("** can't write file **")
+            return False
+        print("{} rows in {:.2f} s ({:.0f} rows/sec)".format(
+            count, seconds, count / seconds if seconds else 0))
+
 if __name__ == '__main__':
     HBNBCommand().cmdloop()
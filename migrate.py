@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+"""
+Copies the objects of one storage engine to the other, each class through
+a pipeline of two processes: python3 -m models.engine.bulk exporting it
+from the source engine as NDJSON, in id order, into a second one
+importing it batch by batch into the target engine. The classes of a
+dependency level are copied in parallel when the target is the database,
+and the last id saved of each class is kept in a checkpoint file, so that
+running the same command again resumes an interrupted migration.
+
+usage: ./migrate.py <file|db> <file|db> [checkpoint file] [batch size]
+"""
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+# the classes by dependency level, each only referring to the classes of
+# the levels before it; place_amenity rows are copied with their places
+levels = [["State", "User", "Amenity"], ["City"], ["Place"], ["Review"]]
+
+
+class Checkpoint:
+    """the last id saved and the state of each class, kept in a file"""
+
+    def __init__(self, path):
+        """reads the checkpoint file if it exists"""
+        self.__path = path
+        self.__lock = threading.Lock()
+        self.__classes = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.__classes = json.load(f)
+
+    def get(self, name):
+        """returns the state of the class name"""
+        with self.__lock:
+            return dict(self.__classes.get(name, {}))
+
+    def update(self, name, **state):
+        """updates the state of the class name and writes the file"""
+        with self.__lock:
+            self.__classes.setdefault(name, {}).update(state)
+            with open(self.__path + ".tmp", "w") as f:
+                json.dump(self.__classes, f)
+            os.replace(self.__path + ".tmp", self.__path)
+
+
+def environment(engine, writer=False):
+    """returns the environment of a process using the storage engine"""
+    env = dict(os.environ)
+    if engine == "db":
+        env["HBNB_TYPE_STORAGE"] = "db"
+    else:
+        env.pop("HBNB_TYPE_STORAGE", None)
+        if writer:
+            # saves append the batch to a log instead of rewriting the file
+            env["HBNB_FILE_JOURNAL"] = "1"
+    return env
+
+
+def migrate(name, source, target, checkpoint, batch_size):
+    """copies the objects of the class name, from where it stopped"""
+    state = checkpoint.get(name)
+    if state.get("done"):
+        print("{}: done before".format(name))
+        return
+    command = [sys.executable, "-m", "models.engine.bulk"]
+    after = [state["after"]] if state.get("after") else []
+    start = time.perf_counter()
+    reader = subprocess.Popen(command + ["export", name] + after,
+                              stdout=subprocess.PIPE,
+                              env=environment(source))
+    writer = subprocess.Popen(command + ["import", str(batch_size)],
+                              stdin=reader.stdout, stdout=subprocess.PIPE,
+                              env=environment(target, True), text=True)
+    reader.stdout.close()
+    count = state.get("count", 0)
+    copied = 0
+    for line in writer.stdout:
+        size, last = line.split()
+        copied += int(size)
+        checkpoint.update(name, after=last, count=count + copied)
+    if writer.wait() or reader.wait():
+        raise RuntimeError("{}: copy failed".format(name))
+    checkpoint.update(name, done=True)
+    seconds = time.perf_counter() - start
+    print("{}: {} rows in {:.2f} s ({:.0f} rows/sec)".format(
+        name, copied, seconds, copied / seconds if seconds else 0))
+
+
+def run(source, target, checkpoint, batch_size):
+    """copies every level in order, the classes of a level in parallel"""
+    for level in levels:
+        if target != "db":
+            for name in level:
+                migrate(name, source, target, checkpoint, batch_size)
+            continue
+        errors = []
+
+        def copy(name):
+            """copies the class name, recording its failure"""
+            try:
+                migrate(name, source, target, checkpoint, batch_size)
+            except RuntimeError as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=copy, args=(name,))
+                   for name in level]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+
+if __name__ == "__main__":
+    if (len(sys.argv) < 3 or sys.argv[1] == sys.argv[2] or
+            not {sys.argv[1], sys.argv[2]} <= {"file", "db"}):
+        print("usage: ./migrate.py <file|db> <file|db> [checkpoint file] "
+              "[batch size]")
+        sys.exit(1)
+    path = sys.argv[3] if len(sys.argv) > 3 else "migrate.checkpoint.json"
+    batch_size = int(sys.argv[4]) if len(sys.argv) > 4 else 1000
+    try:
+        run(sys.argv[1], sys.argv[2], Checkpoint(path), batch_size)
+    except RuntimeError as error:
+        print(error)
+        print("run the same command again to resume")
+        sys.exit(1)
@@ -13,6 +13,22 @@ import uuid
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
 
+
+def parse_time(value):
+    """parses a string in the time format, fromisoformat being faster"""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, time)
+
+
+def format_time(value):
+    """formats a naive datetime in the time format, like strftime(time)"""
+    if value.tzinfo is None and value.year >= 1000:
+        return value.isoformat(timespec="microseconds")
+    return value.strftime(time)
+
+
 if models.storage_t == "db":
     Base = declarative_base()
 else:
@@ -25,19 +41,23 @@ class BaseModel:
         id = Column(String(60), primary_key=True)
         created_at = Column(DateTime, default=datetime.utcnow)
         updated_at = Column(DateTime, default=datetime.utcnow)
+    # set by the storage engines that need touch(), on the objects they hold
+    _stored = False
 
     def __init__(self, *args, **kwargs):
         """Initialization of the base model"""
         if kwargs:
             for key, value in kwargs.items():
-                if key != "__class__":
+                if key not in ("__class__", "created_at", "updated_at"):
                     setattr(self, key, value)
-            if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
+            created_at = kwargs.get("created_at", None)
+            if created_at and type(created_at) is str:
+                self.created_at = parse_time(created_at)
             else:
                 self.created_at = datetime.utcnow()
-            if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
+            updated_at = kwargs.get("updated_at", None)
+            if updated_at and type(updated_at) is str:
+                self.updated_at = parse_time(updated_at)
             else:
                 self.updated_at = datetime.utcnow()
             if kwargs.get("id", None) is None:
@@ -47,10 +67,21 @@ class BaseModel:
             self.created_at = datetime.utcnow()
             self.updated_at = self.created_at
 
+    def __setattr__(self, name, value):
+        """
+        sets an attribute and reports the change to the storage engine if
+        it holds the object
+        """
+        super().__setattr__(name, value)
+        if self._stored and name[0] != "_":
+            models.storage.touch(self, name)
+
     def __str__(self):
         """String representation of the BaseModel class"""
+        attrs = {key: value for key, value in self.__dict__.items()
+                 if key != "_stored"}
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
-                                         self.__dict__)
+                                         attrs)
 
     def save(self):
         """updates the attribute 'updated_at' with the current datetime"""
@@ -58,16 +89,21 @@ class BaseModel:
         models.storage.new(self)
         models.storage.save()
 
-    def to_dict(self, save_fs=None):
-        """returns a dictionary containing all keys/values of the instance"""
+    def to_dict(self, save_fs=None, raw_time=None):
+        """
+        returns a dictionary containing all keys/values of the instance,
+        leaving the datetimes unformatted if raw_time is given
+        """
         new_dict = self.__dict__.copy()
-        if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
-        if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
+        if raw_time is None:
+            if "created_at" in new_dict:
+                new_dict["created_at"] = format_time(new_dict["created_at"])
+            if "updated_at" in new_dict:
+                new_dict["updated_at"] = format_time(new_dict["updated_at"])
         new_dict["__class__"] = self.__class__.__name__
         if "_sa_instance_state" in new_dict:
             del new_dict["_sa_instance_state"]
+        new_dict.pop("_stored", None)
         if save_fs is None:
             if "password" in new_dict:
                 del new_dict["password"]
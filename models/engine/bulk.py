@@ -0,0 +1,181 @@
+#!/usr/bin/python3
+"""
+Contains the functions streaming objects into and out of the storage as
+NDJSON (one to_dict() per line) or CSV (one class per file)
+
+Run as a module, it is one end of a migrate.py pipeline:
+
+usage: python3 -m models.engine.bulk export <class name> [after id]
+       python3 -m models.engine.bulk import <batch size>
+"""
+
+import csv
+import json
+import models
+import sys
+from models.amenity import Amenity
+from models.base_model import BaseModel
+from models.city import City
+from models.engine.file_storage import build
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+import time
+
+classes = {"Amenity": Amenity, "City": City, "Place": Place,
+           "Review": Review, "State": State, "User": User}
+
+
+def fields(cls):
+    """returns the attributes of cls written to a CSV file, in order"""
+    names = ["id", "created_at", "updated_at"]
+    if hasattr(cls, "__table__"):
+        attrs = [column.key for column in cls.__table__.columns]
+    else:
+        attrs = [key for key, value in vars(cls).items()
+                 if not key.startswith("_") and
+                 isinstance(value, (str, int, float, list))]
+    return ["__class__"] + names + [attr for attr in attrs
+                                    if attr not in names]
+
+
+def convert(cls, key, value):
+    """returns the CSV value of the attribute key of cls as its type"""
+    if hasattr(cls, "__table__") and key in cls.__table__.columns:
+        kind = cls.__table__.columns[key].type.python_type
+    else:
+        kind = type(getattr(cls, key, None))
+    if kind in (int, float):
+        return kind(value)
+    if kind is list:
+        return json.loads(value)
+    return value
+
+
+def record_of(obj):
+    """returns the to_dict() of obj without its related objects"""
+    record = obj.to_dict(save_fs=1)
+    for key, value in list(record.items()):
+        if isinstance(value, list):
+            value = value[:1]
+        else:
+            value = [value]
+        if value and isinstance(value[0], BaseModel):
+            del record[key]
+    return record
+
+
+def read(f, fmt, cls=None):
+    """
+    yields the records of a file of format "ndjson" or "csv", of class
+    cls if their __class__ is missing
+    """
+    if fmt == "csv":
+        for row in csv.DictReader(f):
+            name = row.pop("__class__", None) or cls.__name__
+            record = {key: convert(classes[name], key, value)
+                      for key, value in row.items() if value != ""}
+            record["__class__"] = name
+            yield record
+        return
+    for line in f:
+        if line.strip():
+            record = json.loads(line)
+            if "__class__" not in record:
+                record["__class__"] = cls.__name__
+            yield record
+
+
+def load(records, batch_size=1000):
+    """
+    creates the objects of records, adding them to the storage batch by
+    batch and saving once, and returns their number and the seconds spent
+    """
+    start = time.perf_counter()
+    count = 0
+    batch = []
+    for record in records:
+        batch.append(build(record))
+        if len(batch) == batch_size:
+            models.storage.bulk_new(batch)
+            count += len(batch)
+            batch = []
+    models.storage.bulk_new(batch)
+    count += len(batch)
+    models.storage.save()
+    return count, time.perf_counter() - start
+
+
+def export(f, fmt, clss=None, batch_size=1000, after=None):
+    """
+    writes the objects of clss (every class if None) to f in format
+    "ndjson" or "csv", reading them page by page in id order from the id
+    after on, and returns their number and the seconds spent
+    """
+    start = time.perf_counter()
+    if clss is None:
+        clss = classes.values()
+    count = 0
+    for cls in clss:
+        if fmt == "csv":
+            writer = csv.DictWriter(f, fields(cls), extrasaction="ignore")
+            writer.writeheader()
+        page = models.storage.page(cls, batch_size, after)
+        while page:
+            if cls is Place and models.storage_t == "db":
+                links = models.storage.place_amenities(
+                    [obj.id for obj in page])
+            for obj in page:
+                record = record_of(obj)
+                if cls is Place and models.storage_t == "db":
+                    record["amenity_ids"] = links[obj.id]
+                if fmt == "csv":
+                    writer.writerow({key: json.dumps(value)
+                                     if isinstance(value, list) else value
+                                     for key, value in record.items()})
+                else:
+                    f.write(json.dumps(record) + "\n")
+            count += len(page)
+            if len(page) < batch_size:
+                break
+            page = models.storage.page(cls, batch_size, page[-1].id)
+    return count, time.perf_counter() - start
+
+
+def insert(records, batch_size):
+    """
+    adds the records of a class not yet in the storage, saving after each
+    batch and printing its size and last id, so that an interrupted
+    migration can resume after it; a journaled file storage is compacted
+    at the end, once its background compaction is over
+    """
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == batch_size:
+            insert_batch(batch)
+            batch = []
+    if batch:
+        insert_batch(batch)
+    if hasattr(models.storage, "compact"):
+        models.storage.compact()
+
+
+def insert_batch(records):
+    """adds and saves one batch of records of a class, see insert()"""
+    cls = classes[records[0]["__class__"]]
+    ids = [record["id"] for record in records]
+    known = {obj.id for obj in models.storage.get_many(cls, ids)}
+    models.storage.bulk_new([build(record) for record in records
+                             if record["id"] not in known])
+    models.storage.save()
+    print(len(records), ids[-1], flush=True)
+
+
+if __name__ == "__main__":
+    if sys.argv[1] == "export":
+        after = sys.argv[3] if len(sys.argv) > 3 else None
+        export(sys.stdout, "ndjson", [classes[sys.argv[2]]], after=after)
+    elif sys.argv[1] == "import":
+        insert(read(sys.stdin, "ndjson"), int(sys.argv[2]))
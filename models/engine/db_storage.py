@@ -13,17 +13,205 @@ from models.state import State
 from models.user import User
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import Column, Integer, String, Table
+from sqlalchemy import create_engine, event, func, insert, or_, select
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.sql.dml import UpdateBase
+import threading
+import time
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
+if models.storage_t == "db":
+    # the number of saves that changed the objects of each class, bumped
+    # in the transaction of the save, for every process to see
+    versions = Table('versions', Base.metadata,
+                     Column('name', String(60), primary_key=True),
+                     Column('version', Integer, nullable=False, default=0))
+
+
+class PoolStats:
+    """
+    counters of the checkouts of a pool that waited for a connection,
+    kept up to date by its checkout and checkin events
+    """
+
+    def __init__(self, pool, limit):
+        """
+        counts the checkouts of pool that find limit connections (None
+        for no limit) already in use
+        """
+        self.limit = limit
+        self.in_use = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+        self.__lock = threading.Lock()
+        event.listen(pool, "checkout", self.checked_out)
+        event.listen(pool, "checkin", self.checked_in)
+
+    def checked_out(self, dbapi_connection, record, proxy):
+        """checkout handler counting a connection in use"""
+        with self.__lock:
+            self.in_use += 1
+
+    def checked_in(self, dbapi_connection, record):
+        """checkin handler counting a connection given back"""
+        with self.__lock:
+            self.in_use -= 1
+
+    def time(self, connect):
+        """returns connect(), timing it if every connection is in use"""
+        with self.__lock:
+            waited = self.limit is not None and self.in_use >= self.limit
+        if not waited:
+            return connect()
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return connect()
+        except sqlalchemy.exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            with self.__lock:
+                self.waits += 1
+                self.wait_time += time.perf_counter() - start
+                self.timeouts += timed_out
+
+    def counters(self):
+        """returns the waits, their total time in seconds and timeouts"""
+        with self.__lock:
+            return {"waits": self.waits, "wait_time": self.wait_time,
+                    "timeouts": self.timeouts}
+
+
+class WaitCountingQueuePool(QueuePool):
+    """QueuePool counting the checkouts that waited for a connection"""
+
+    def __init__(self, *args, max_overflow=10, **kwargs):
+        """creates the pool with the PoolStats of its checkouts"""
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        limit = None if max_overflow < 0 else self.size() + max_overflow
+        self.stats = PoolStats(self, limit)
+
+    def connect(self):
+        """checks out a connection, see PoolStats.time()"""
+        return self.stats.time(super().connect)
+
+
+def pool_counters(pool):
+    """returns the connection counters of a pool, see pool_stats()"""
+    stats = {"pool": pool.__class__.__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        if hasattr(pool, name):
+            stats[name] = getattr(pool, name)()
+    if hasattr(pool, "stats"):
+        stats.update(pool.stats.counters())
+    return stats
+
+
+def record_changes(session, flush_context=None, instances=None):
+    """
+    before_flush handler keeping the objects each flush writes in
+    session.info, until DBStorage.save() reports them after the commit
+    """
+    changes = session.info.setdefault("changes", {})
+    for obj in list(session.new) + list(session.dirty):
+        changes[obj.__class__.__name__ + '.' + obj.id] = obj
+    for obj in session.deleted:
+        changes[obj.__class__.__name__ + '.' + obj.id] = None
+
+
+def forget_changes(session, previous_transaction=None):
+    """after_rollback handler dropping the changes kept by flushes"""
+    session.info.pop("changes", None)
+
+
+class Replicas:
+    """
+    the engines of the read replicas, handed out round-robin; a replica
+    is checked with a SELECT 1 at most every interval seconds, and is
+    skipped until a later check succeeds if that fails
+    """
+
+    def __init__(self, urls, interval=10, **options):
+        """creates an engine with the pool options for each url"""
+        self.engines = [create_engine(url, **options) for url in urls]
+        self.interval = interval
+        self.__healthy = [True] * len(self.engines)
+        self.__checked = [None] * len(self.engines)
+        self.__next = 0
+        self.__lock = threading.Lock()
+
+    def healthy(self, i):
+        """returns whether the replica i answers, checking it if due"""
+        now = time.monotonic()
+        with self.__lock:
+            if (self.__checked[i] is not None and
+                    now - self.__checked[i] < self.interval):
+                return self.__healthy[i]
+            self.__checked[i] = now
+        try:
+            with self.engines[i].connect() as connection:
+                connection.exec_driver_sql("SELECT 1")
+            self.__healthy[i] = True
+        except sqlalchemy.exc.DBAPIError:
+            self.__healthy[i] = False
+        return self.__healthy[i]
+
+    def next(self):
+        """returns the next healthy replica engine, None if there is none"""
+        for _ in range(len(self.engines)):
+            with self.__lock:
+                i = self.__next
+                self.__next = (i + 1) % len(self.engines)
+            if self.healthy(i):
+                return self.engines[i]
+        return None
+
+    def stats(self):
+        """returns the health and the pool counters of each replica"""
+        return [dict(pool_counters(engine.pool), healthy=self.__healthy[i])
+                for i, engine in enumerate(self.engines)]
+
+
+class RoutingSession(Session):
+    """
+    Session running its reads on one replica, until it writes: its
+    flushes and INSERT, UPDATE and DELETE statements, and every statement
+    after them, run on the primary engine it is bound to, so that a
+    request reads its own writes
+    """
+
+    def __init__(self, replicas=None, **kwargs):
+        """creates a session reading from replicas when not None"""
+        super().__init__(**kwargs)
+        self.replicas = replicas
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        """returns the engine running the statement clause"""
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info["wrote"] = True
+        if self.replicas is None or self.info.get("wrote"):
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        if "replica" not in self.info:
+            self.info["replica"] = self.replicas.next()
+        if self.info["replica"] is None:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        return self.info["replica"]
+
 
 class DBStorage:
     """interaacts with the MySQL database"""
+    # number of rows fetched at a time by the queries without a limit
+    yield_rows = 1000
     __engine = None
+    __replicas = None
     __session = None
+    __listeners = []
 
     def __init__(self):
         """Instantiate a DBStorage object"""
@@ -36,10 +224,48 @@ class DBStorage:
                                       format(HBNB_MYSQL_USER,
                                              HBNB_MYSQL_PWD,
                                              HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+                                             HBNB_MYSQL_DB),
+                                      **self.pool_options())
+        HBNB_MYSQL_REPLICAS = getenv('HBNB_MYSQL_REPLICAS')
+        if HBNB_MYSQL_REPLICAS:
+            self.__replicas = Replicas(
+                HBNB_MYSQL_REPLICAS.split(','),
+                float(getenv('HBNB_MYSQL_REPLICA_CHECK', '10')),
+                **self.pool_options())
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
+    @staticmethod
+    def pool_options():
+        """
+        returns the connection pool settings of create_engine, read from
+        the environment: HBNB_MYSQL_POOL_SIZE (5), HBNB_MYSQL_MAX_OVERFLOW
+        (10), HBNB_MYSQL_POOL_TIMEOUT (30 seconds), HBNB_MYSQL_POOL_RECYCLE
+        (3600 seconds, below the MySQL wait_timeout) and
+        HBNB_MYSQL_POOL_PRE_PING (1, testing connections on checkout)
+        """
+        return {"poolclass": WaitCountingQueuePool,
+                "pool_size": int(getenv('HBNB_MYSQL_POOL_SIZE', '5')),
+                "max_overflow": int(getenv('HBNB_MYSQL_MAX_OVERFLOW', '10')),
+                "pool_timeout": float(getenv('HBNB_MYSQL_POOL_TIMEOUT',
+                                             '30')),
+                "pool_recycle": int(getenv('HBNB_MYSQL_POOL_RECYCLE',
+                                           '3600')),
+                "pool_pre_ping": getenv('HBNB_MYSQL_POOL_PRE_PING',
+                                        '1') == '1'}
+
+    def pool_stats(self):
+        """
+        returns the size of the connection pool, the connections checked
+        in and out, the overflow ones, and the checkouts that waited for
+        a connection, how long in all, and how many timed out, along with
+        the health and the same counters of each read replica
+        """
+        stats = pool_counters(self.__engine.pool)
+        if self.__replicas is not None:
+            stats["replicas"] = self.__replicas.stats()
+        return stats
+
     def all(self, cls=None):
         """query on the current database session"""
         new_dict = {}
@@ -51,13 +277,110 @@ class DBStorage:
                     new_dict[key] = obj
         return (new_dict)
 
+    def all_by(self, cls, attr, value):
+        """returns the objects of cls whose attribute attr equals value"""
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return {}
+        objs = self.__session.query(cls).filter(getattr(cls, attr) == value)
+        return {obj.__class__.__name__ + '.' + obj.id: obj for obj in objs}
+
+    def page(self, cls, limit=None, after=None, attr=None, value=None):
+        """
+        Returns, in id order, up to limit objects of cls whose id comes
+        after the id after (and whose attribute attr equals value if attr
+        is given), or all of them unordered if neither limit nor after is
+        given; without a limit, the objects are an iterable read from the
+        database yield_rows at a time as it is iterated
+        """
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return []
+        query = self.__session.query(cls)
+        if attr is not None:
+            query = query.filter(getattr(cls, attr) == value)
+        return self.__slice(query, cls, limit, after)
+
+    def __slice(self, query, cls, limit, after):
+        """
+        returns the objects of query up to limit in id order from the id
+        after on, or an iterable reading them in batches without a limit
+        """
+        if after is not None:
+            query = query.filter(cls.id > after)
+        if limit is not None or after is not None:
+            query = query.order_by(cls.id)
+        if limit is None:
+            return query.yield_per(self.yield_rows)
+        return query.limit(limit).all()
+
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
 
+    def bulk_new(self, objs):
+        """
+        inserts a list of new objects with one executemany INSERT per
+        class, skipping the unit of work of the session; the columns they
+        leave unset get their defaults, and the amenity_ids of places
+        become place_amenity rows
+        """
+        from models.place import place_amenity
+
+        by_class = {}
+        changes = self.__session.info.setdefault("changes", {})
+        for obj in objs:
+            by_class.setdefault(type(obj), []).append(obj)
+            changes[obj.__class__.__name__ + '.' + obj.id] = obj
+        for cls, same in by_class.items():
+            columns = [column.key for column in cls.__table__.columns]
+            self.__session.execute(insert(cls), [
+                {column: obj.__dict__[column] for column in columns
+                 if column in obj.__dict__}
+                for obj in same])
+            if cls is Place:
+                links = [{"place_id": obj.id, "amenity_id": amenity_id}
+                         for obj in same
+                         for amenity_id in obj.__dict__.get("amenity_ids",
+                                                            [])]
+                if links:
+                    self.__session.execute(place_amenity.insert(), links)
+
+    def touch(self, obj, name):
+        """nothing to do, the session tracks changes to mapped attributes"""
+        pass
+
     def save(self):
-        """commit all changes of the current database session"""
-        self.__session.commit()
+        """
+        commit all changes of the current database session, bumping the
+        versions of the classes they touch, then report them to the
+        listeners, the ones autoflushed before included
+        """
+        session = self.__session
+        session.flush()
+        names = {key.split('.', 1)[0]
+                 for key in session.info.get("changes", {})}
+        if names:
+            session.execute(versions.update()
+                            .where(versions.c.name.in_(names))
+                            .values(version=versions.c.version + 1))
+        session.commit()
+        changes = session.info.pop("changes", {})
+        for listener in self.__listeners:
+            listener(changes)
+
+    def rollback(self):
+        """discards the changes of the current database session"""
+        self.__session.rollback()
+
+    def subscribe(self, listener):
+        """
+        registers listener to be called after each save() with a dict of
+        the <class name>.id keys committed to their obj, None if deleted
+        """
+        self.__listeners.append(listener)
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
@@ -67,10 +390,53 @@ class DBStorage:
     def reload(self):
         """reloads data from the database"""
         Base.metadata.create_all(self.__engine)
-        sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        with self.__engine.begin() as connection:
+            known = {name for name, in
+                     connection.execute(select(versions.c.name))}
+            missing = [{"name": name, "version": 0} for name in classes
+                       if name not in known]
+            if missing:
+                try:
+                    connection.execute(versions.insert(), missing)
+                except sqlalchemy.exc.IntegrityError:
+                    # another process added them first
+                    pass
+        sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False,
+                                    class_=RoutingSession,
+                                    replicas=self.__replicas)
+        event.listen(sess_factory, "before_flush", record_changes)
+        event.listen(sess_factory, "after_rollback", forget_changes)
         Session = scoped_session(sess_factory)
         self.__session = Session
 
+    def missing_indexes(self):
+        """
+        returns the indexes the models declare that the existing tables of
+        the database lack; an index or primary key starting with the same
+        columns, like the indexes MySQL creates for foreign keys, counts
+        """
+        inspector = sqlalchemy.inspect(self.__engine)
+        tables = set(inspector.get_table_names())
+        missing = []
+        for table in Base.metadata.sorted_tables:
+            if table.name not in tables:
+                continue
+            existing = [index["column_names"]
+                        for index in inspector.get_indexes(table.name)]
+            existing.append(inspector.get_pk_constraint(
+                table.name)["constrained_columns"])
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                columns = [column.name for column in index.columns]
+                if not any(list(names[:len(columns)]) == columns
+                           for names in existing):
+                    missing.append(index)
+        return missing
+
+    def create_indexes(self, indexes):
+        """creates the indexes returned by missing_indexes()"""
+        for index in indexes:
+            index.create(self.__engine)
+
     def close(self):
         """call remove() method on the private session attribute"""
         self.__session.remove()
@@ -83,24 +449,108 @@ class DBStorage:
         if cls not in classes.values():
             return None
 
-        all_cls = models.storage.all(cls)
-        for value in all_cls.values():
-            if (value.id == id):
-                return value
+        return self.__session.get(cls, id)
 
-        return None
+    def get_many(self, cls, ids):
+        """
+        Returns the objects of a class matching a list of IDs, in the
+        order of the IDs, fetched with a single IN query
+        """
+        if cls not in classes.values() or not ids:
+            return []
+
+        found = {}
+        for obj in self.__session.query(cls).filter(cls.id.in_(set(ids))):
+            found[obj.id] = obj
+        return [found[id] for id in ids if id in found]
+
+    def search_places(self, states=None, cities=None, amenities=None,
+                      limit=None, after=None):
+        """
+        Returns the places located in the given states or cities (all
+        places if there are none) that have every given amenity, with a
+        single SELECT filtering on subqueries instead of walking the
+        relationships; like page(), up to limit of them in id order from
+        the id after on if either is given, and read in batches without a
+        limit
+        """
+        from models.place import place_amenity
+
+        query = self.__session.query(Place)
+        if states or cities:
+            located = []
+            if states:
+                in_states = select(City.id).where(City.state_id.in_(states))
+                located.append(Place.city_id.in_(in_states))
+            if cities:
+                located.append(Place.city_id.in_(cities))
+            query = query.filter(or_(*located))
+        if amenities:
+            amenities = set(amenities)
+            with_all = (select(place_amenity.c.place_id)
+                        .where(place_amenity.c.amenity_id.in_(amenities))
+                        .group_by(place_amenity.c.place_id)
+                        .having(func.count() == len(amenities)))
+            query = query.filter(Place.id.in_(with_all))
+        return self.__slice(query, Place, limit, after)
+
+    def place_amenities(self, place_ids=None):
+        """
+        Returns the amenity ids of the given places, or of every place,
+        keyed by place id, read from place_amenity in a single query
+        """
+        from models.place import place_amenity
+
+        query = select(place_amenity.c.place_id, place_amenity.c.amenity_id)
+        if place_ids is None:
+            amenities = {place_id: [] for place_id, in
+                         self.__session.execute(select(Place.id))}
+        else:
+            amenities = {place_id: [] for place_id in place_ids}
+            query = query.where(place_amenity.c.place_id.in_(place_ids))
+        for place_id, amenity_id in self.__session.execute(query):
+            amenities[place_id].append(amenity_id)
+        return amenities
+
+    def version(self, cls):
+        """
+        Returns a string that changes whenever objects of cls are added,
+        deleted or changed by a save(), in any process, read from the
+        versions table by primary key
+        """
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return ""
+        version = self.__session.execute(
+            select(versions.c.version)
+            .where(versions.c.name == cls.__name__)).scalar()
+        return "{}.{}".format(cls.__name__, version)
 
     def count(self, cls=None):
         """
         count the number of objects in storage
         """
-        all_class = classes.values()
-
         if not cls:
-            count = 0
-            for clas in all_class:
-                count += len(models.storage.all(clas).values())
-        else:
-            count = len(models.storage.all(cls).values())
+            return sum(self.counts().values())
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return 0
+        return self.__session.query(func.count(cls.id)).scalar()
 
-        return count
+    def counts(self, clss=None):
+        """
+        count the number of objects of each class, keyed by class name,
+        with a single SELECT of one COUNT(*) subquery per table
+        """
+        if clss is None:
+            clss = classes.values()
+        clss = [cls for cls in clss if cls in classes.values()]
+        if not clss:
+            return {}
+        stmt = select(*[select(func.count()).select_from(cls)
+                        .scalar_subquery().label(cls.__name__)
+                        for cls in clss])
+        row = self.__session.execute(stmt).one()
+        return {cls.__name__: row[i] for i, cls in enumerate(clss)}
@@ -3,8 +3,11 @@
 Contains the FileStorage class
 """
 
+from bisect import bisect_right, insort
 import json
 import models
+import os
+import threading
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
@@ -13,65 +16,466 @@ from models.review import Review
 from models.state import State
 from models.user import User
 from hashlib import md5
+from os import getenv
+from uuid import uuid4
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
 
+def build(record):
+    """
+    returns the object of a stored record, its password being the stored
+    hash, which User.__setattr__ would hash again
+    """
+    obj = classes[record["__class__"]](**record)
+    if "password" in record:
+        obj.__dict__["password"] = record["password"]
+    return obj
+
+
 class FileStorage:
     """serializes instances to a JSON file & deserializes back to instances"""
 
+    # string - "json" for one JSON object, "jsonl" for one object per line
+    __format = getenv("HBNB_FILE_FORMAT", "json")
     # string - path to the JSON file
-    __file_path = "file.json"
+    __file_path = "file.jsonl" if __format == "jsonl" else "file.json"
+    # bool - keep each class in its own file, loaded on first use
+    __sharded = getenv("HBNB_FILE_LAYOUT") == "sharded"
+    # set - shards read from disk since the last reload()
+    __loaded = set()
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - <class name> -> {<class name>.id: obj}, mirrors __objects
+    __by_class = {}
+    # the __objects dictionary that __by_class was built from
+    __indexed = None
+    # class name -> sorted list of the ids of its objects, built on demand
+    __sorted = {}
+    # dictionary - <class name> -> foreign key attributes to index, a list
+    # attribute being indexed under each of its values
+    __foreign_keys = {"City": ("state_id",),
+                      "Place": ("city_id",),
+                      "Review": ("place_id",)}
+    # dictionary - (<class name>, attribute) -> {value: {key: obj}}
+    __by_fk = {}
+    # dictionary - <class name>.id -> {attribute: values indexed}
+    __fk_of = {}
+    # bool - append changes to a log instead of rewriting the JSON file
+    __journal = getenv("HBNB_FILE_JOURNAL") == "1"
+    # int - number of logged records that triggers a compaction
+    __compact_every = int(getenv("HBNB_FILE_COMPACT_EVERY", "10000"))
+    # set - <class name>.id keys created, changed or deleted since save()
+    # new(), delete() and touch() add to it, save() flushes and resets it
+    __dirty = set()
+    # int - number of records appended to the logs since the last rotation
+    __logged = 0
+    # thread - background compaction in progress, if any
+    __compactor = None
+    # lock - serializes writes to the JSON files and their logs
+    __lock = threading.Lock()
+    # lock - held for a whole compaction, so that two never overlap
+    __compacting = threading.Lock()
+    # tuple - on-disk state of the JSON files and their logs when last synced
+    __synced = None
+    # list - callables notified of the objects each save() persisted
+    __listeners = []
+    # changes on each reload(), so that versions never repeat
+    __epoch = uuid4().hex
+    # class name -> number of saves that changed its objects since reload
+    __versions = {}
+
+    def __index(self):
+        """returns the per-class index, rebuilding it if __objects changed"""
+        if FileStorage.__indexed is not self.__objects:
+            by_class = {}
+            FileStorage.__by_fk = {}
+            FileStorage.__fk_of = {}
+            FileStorage.__sorted = {}
+            for key, value in self.__objects.items():
+                name = value.__class__.__name__
+                by_class.setdefault(name, {})[key] = value
+                self.__link(key, value)
+            FileStorage.__by_class = by_class
+            FileStorage.__indexed = self.__objects
+        return FileStorage.__by_class
+
+    def __link(self, key, obj):
+        """adds obj to the indexes of its foreign keys"""
+        name = obj.__class__.__name__
+        linked = {}
+        for attr in self.__foreign_keys.get(name, ()):
+            values = getattr(obj, attr, None)
+            values = list(values) if isinstance(values, list) else [values]
+            index = self.__by_fk.setdefault((name, attr), {})
+            for value in values:
+                index.setdefault(value, {})[key] = obj
+            linked[attr] = values
+        if linked:
+            self.__fk_of[key] = linked
+
+    def __unlink(self, key):
+        """removes key from the indexes of its foreign keys"""
+        name = key.split(".", 1)[0]
+        for attr, values in self.__fk_of.pop(key, {}).items():
+            index = self.__by_fk.get((name, attr), {})
+            for value in values:
+                objs = index.get(value, {})
+                objs.pop(key, None)
+                if not objs:
+                    index.pop(value, None)
+
+    def __shard(self, name):
+        """returns the shard holding the objects of the class name"""
+        return name if self.__sharded else None
+
+    def __shards(self):
+        """returns every shard, None being the single unsharded file"""
+        return list(classes) if self.__sharded else [None]
+
+    def __path(self, shard):
+        """returns the path of the file of a shard"""
+        if shard is None:
+            return self.__file_path
+        root, ext = os.path.splitext(self.__file_path)
+        return "{}.{}{}".format(root, shard, ext)
+
+    def __ensure(self, name=None):
+        """reads the shard of the class name, or every shard, if needed"""
+        if name is None:
+            shards = self.__shards()
+        else:
+            shards = [self.__shard(name)]
+        for shard in shards:
+            if shard not in self.__loaded:
+                self.__loaded.add(shard)
+                self.__read(shard)
+
+    def __put(self, key, obj):
+        """stores obj under key in __objects and the per-class index"""
+        index = self.__index()
+        self.__unlink(key)
+        name = obj.__class__.__name__
+        if key not in self.__objects and name in self.__sorted:
+            insort(self.__sorted[name], obj.id)
+        self.__objects[key] = obj
+        index.setdefault(name, {})[key] = obj
+        self.__link(key, obj)
+        obj._stored = True
+
+    def __pop(self, key):
+        """removes key from __objects and the per-class index"""
+        index = self.__index()
+        obj = self.__objects.pop(key, None)
+        if obj is not None:
+            obj._stored = False
+            name = obj.__class__.__name__
+            index.get(name, {}).pop(key, None)
+            self.__unlink(key)
+            ids = self.__sorted.get(name)
+            if ids is not None:
+                at = bisect_right(ids, obj.id) - 1
+                if at >= 0 and ids[at] == obj.id:
+                    del ids[at]
 
     def all(self, cls=None):
         """returns the dictionary __objects"""
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
+            if not isinstance(cls, str):
+                cls = cls.__name__
+            self.__ensure(cls)
+            return dict(self.__index().get(cls, {}))
+        self.__ensure()
         return self.__objects
 
+    def all_by(self, cls, attr, value):
+        """returns the objects of cls whose attribute attr equals value"""
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.__ensure(cls)
+        index = self.__index()
+        if attr in self.__foreign_keys.get(cls, ()):
+            return dict(self.__by_fk.get((cls, attr), {}).get(value, {}))
+        return {key: obj for key, obj in index.get(cls, {}).items()
+                if getattr(obj, attr, None) == value}
+
+    def page(self, cls, limit=None, after=None, attr=None, value=None):
+        """
+        Returns, in id order, up to limit objects of cls whose id comes
+        after the id after (and whose attribute attr equals value if attr
+        is given), or all of them unordered if neither limit nor after is
+        given
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        if attr is not None:
+            objs = self.all_by(cls, attr, value)
+        else:
+            self.__ensure(cls)
+            objs = self.__index().get(cls, {})
+        if limit is None and after is None:
+            return list(objs.values())
+        if attr is not None:
+            ids = sorted(obj.id for obj in objs.values())
+        else:
+            if cls not in self.__sorted:
+                self.__sorted[cls] = sorted(obj.id for obj in objs.values())
+            ids = self.__sorted[cls]
+        start = 0 if after is None else bisect_right(ids, after)
+        end = None if limit is None else start + limit
+        return [objs[cls + "." + id] for id in ids[start:end]]
+
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
         if obj is not None:
-            key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+            name = obj.__class__.__name__
+            key = name + "." + obj.id
+            self.__ensure(name)
+            self.__put(key, obj)
+            self.__dirty.add(key)
+
+    def bulk_new(self, objs):
+        """adds a list of objects, written by the next save() at once"""
+        for obj in objs:
+            self.new(obj)
+
+    def touch(self, obj, name):
+        """
+        flags a stored obj as dirty after its attribute name was set,
+        called by BaseModel on the objects __put() marked as _stored
+        """
+        key = obj.__class__.__name__ + "." + str(getattr(obj, "id", None))
+        if self.__objects.get(key) is obj:
+            self.__dirty.add(key)
+            if name in self.__foreign_keys.get(obj.__class__.__name__, ()):
+                self.__index()
+                self.__unlink(key)
+                self.__link(key, obj)
 
     def save(self):
         """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            if key == "password":
-                json_objects[key].decode()
-            json_objects[key] = self.__objects[key].to_dict(save_fs=1)
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+        if self.__journal:
+            self.__notify(self.__append())
+            return
+        with self.__lock:
+            dirty, FileStorage.__dirty = self.__dirty, set()
+            if self.__sharded:
+                shards = {key.split(".", 1)[0] for key in dirty}
+            else:
+                shards = [None]
+            for shard in shards:
+                self.__ensure(shard)
+                if shard is None:
+                    objs = list(self.__objects.items())
+                else:
+                    objs = list(self.__index().get(shard, {}).items())
+                with open(self.__path(shard), 'w') as f:
+                    self.__dump(f, objs)
+                for path in self.__logs(shard):
+                    if os.path.exists(path):
+                        os.remove(path)
+            FileStorage.__logged = 0
+            FileStorage.__synced = self.__stat()
+        self.__notify(dirty)
+
+    def rollback(self):
+        """
+        discards the unsaved changes, reading the objects back from disk
+        into a new dictionary, reload() only adding to the current one
+        """
+        FileStorage.__objects = {}
+        self.reload()
+
+    def subscribe(self, listener):
+        """
+        registers listener to be called after each save() with a dict of
+        the <class name>.id keys saved to their obj, None if deleted, and
+        with None after reload() as any object may have changed
+        """
+        self.__listeners.append(listener)
+
+    def __notify(self, dirty):
+        """
+        bumps the version of the classes of the dirty keys, then calls the
+        listeners with their objects
+        """
+        for name in {key.split(".", 1)[0] for key in dirty or ()}:
+            self.__versions[name] = self.__versions.get(name, 0) + 1
+        if not self.__listeners:
+            return
+        changes = None
+        if dirty is not None:
+            changes = {key: self.__objects.get(key) for key in dirty}
+        for listener in self.__listeners:
+            listener(changes)
+
+    def __dump(self, f, objs):
+        """writes (key, obj) pairs to f one record at a time"""
+        if self.__format == "jsonl":
+            for key, obj in objs:
+                f.write(json.dumps(obj.to_dict(save_fs=1)) + "\n")
+            return
+        f.write("{")
+        for i, (key, obj) in enumerate(objs):
+            f.write("{}{}: {}".format(", " if i else "", json.dumps(key),
+                                      json.dumps(obj.to_dict(save_fs=1))))
+        f.write("}")
+
+    def __load(self, f):
+        """builds objects from f, dropping each raw record once it's used"""
+        if self.__format == "jsonl":
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    obj = build(record)
+                    self.__put(record["__class__"] + "." + obj.id, obj)
+            return
+        jo = json.load(f)
+        for key in list(jo):
+            record = jo.pop(key)
+            self.__put(key, build(record))
+
+    def __logs(self, shard=None):
+        """returns the rotated and the current log paths, oldest first"""
+        path = self.__path(shard)
+        return [path + ".log.1", path + ".log"]
+
+    def __stat(self):
+        """returns the inode, size and mtime of the JSON files and logs"""
+        stat = []
+        for shard in self.__shards():
+            for path in [self.__path(shard)] + self.__logs(shard):
+                try:
+                    st = os.stat(path)
+                    stat.append((st.st_ino, st.st_size, st.st_mtime_ns))
+                except OSError:
+                    stat.append(None)
+        return tuple(stat)
+
+    def __append(self):
+        """
+        appends the dirty objects to the logs, a null obj for deletions,
+        and returns their keys
+        """
+        with self.__lock:
+            dirty, FileStorage.__dirty = self.__dirty, set()
+            lines = {}
+            for key in dirty:
+                obj = self.__objects.get(key)
+                if obj is not None:
+                    obj = obj.to_dict(save_fs=1)
+                shard = self.__shard(key.split(".", 1)[0])
+                lines.setdefault(shard, []).append(
+                    json.dumps({"key": key, "obj": obj}) + "\n")
+                FileStorage.__logged += 1
+            for shard in lines:
+                with open(self.__logs(shard)[1], 'a') as f:
+                    f.writelines(lines[shard])
+            FileStorage.__synced = self.__stat()
+            compacting = self.__compactor and self.__compactor.is_alive()
+            if FileStorage.__logged >= self.__compact_every and \
+                    not compacting:
+                FileStorage.__compactor = threading.Thread(
+                    target=self.compact, daemon=True)
+                self.__compactor.start()
+        return dirty
+
+    def compact(self):
+        """
+        folds the logs of the loaded shards into their JSON files, after
+        the compaction in progress in the background, if any
+        """
+        compactor = self.__compactor
+        if compactor is not None and \
+                compactor is not threading.current_thread():
+            compactor.join()
+        with self.__compacting:
+            self.__compact()
+
+    def __compact(self):
+        """folds the logs into the JSON files, see compact()"""
+        with self.__lock:
+            FileStorage.__logged = 0
+            shards = [shard for shard in self.__shards()
+                      if shard in self.__loaded]
+        for shard in shards:
+            rotated, current = self.__logs(shard)
+            with self.__lock:
+                if os.path.exists(current):
+                    with open(current, 'r') as src, open(rotated, 'a') as dst:
+                        dst.write(src.read())
+                    os.remove(current)
+                if shard is None:
+                    objs = list(self.__objects.items())
+                else:
+                    objs = list(self.__index().get(shard, {}).items())
+            tmp = "{}.{}.tmp".format(self.__path(shard), uuid4().hex)
+            with open(tmp, 'w') as f:
+                self.__dump(f, objs)
+            with self.__lock:
+                os.replace(tmp, self.__path(shard))
+                if os.path.exists(rotated):
+                    os.remove(rotated)
+                FileStorage.__synced = self.__stat()
 
     def reload(self):
-        """deserializes the JSON file to __objects"""
+        """deserializes the JSON file and replays its logs to __objects"""
+        with self.__lock:
+            synced = self.__stat()
+        FileStorage.__loaded = set()
+        if not self.__sharded:
+            self.__ensure()
+        self.__dirty.clear()
+        FileStorage.__synced = synced
+        FileStorage.__epoch = uuid4().hex
+        FileStorage.__versions = {}
+        self.__notify(None)
+
+    def __read(self, shard):
+        """deserializes the file of a shard and replays its logs"""
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
+            with open(self.__path(shard), 'r') as f:
+                self.__load(f)
         except:
             pass
+        for path in self.__logs(shard):
+            self.__replay(path)
+
+    def __replay(self, path):
+        """applies the records of a log to __objects"""
+        try:
+            with open(path, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    obj = record["obj"]
+                    if obj is not None:
+                        obj = build(obj)
+                        self.__put(record["key"], obj)
+                    else:
+                        self.__pop(record["key"])
+        except OSError:
+            pass
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
-            key = obj.__class__.__name__ + '.' + obj.id
+            name = obj.__class__.__name__
+            key = name + '.' + obj.id
+            self.__ensure(name)
             if key in self.__objects:
-                del self.__objects[key]
+                self.__pop(key)
+                self.__dirty.add(key)
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """call reload() if the JSON files or their logs changed on disk"""
+        with self.__lock:
+            changed = self.__stat() != self.__synced
+        if changed:
+            self.reload()
 
     def get(self, cls, id):
         """
@@ -81,24 +485,59 @@ class FileStorage:
         if cls not in classes.values():
             return None
 
-        all_cls = models.storage.all(cls)
-        for value in all_cls.values():
-            if (value.id == id):
-                return value
+        self.__ensure(cls.__name__)
+        return self.__objects.get(cls.__name__ + "." + str(id))
+
+    def get_many(self, cls, ids):
+        """
+        Returns the objects of a class matching a list of IDs, in the
+        order of the IDs, skipping the ones not found
+        """
+        if cls not in classes.values() or not ids:
+            return []
+
+        self.__ensure(cls.__name__)
+        prefix = cls.__name__ + "."
+        objs = [self.__objects.get(prefix + str(id)) for id in ids]
+        return [obj for obj in objs if obj is not None]
+
+    def place_amenities(self, place_ids=None):
+        """
+        Returns the amenity ids of the given places, or of every place,
+        keyed by place id
+        """
+        if place_ids is None:
+            places = self.all(Place).values()
+        else:
+            places = self.get_many(Place, place_ids)
+        return {place.id: list(place.amenity_ids) for place in places}
 
-        return None
+    def version(self, cls):
+        """
+        Returns a string that changes whenever objects of cls are saved,
+        deleted or reloaded
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        return "{}.{}-{}".format(cls, self.__epoch,
+                                 self.__versions.get(cls, 0))
 
     def count(self, cls=None):
         """
         count the number of objects in storage
         """
-        all_class = classes.values()
-
         if not cls:
-            count = 0
-            for clas in all_class:
-                count += len(models.storage.all(clas).values())
-        else:
-            count = len(models.storage.all(cls).values())
+            self.__ensure()
+            return len(self.__objects)
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.__ensure(cls)
+        return len(self.__index().get(cls, {}))
 
-        return count
+    def counts(self, clss=None):
+        """
+        count the number of objects of each class, keyed by class name
+        """
+        if clss is None:
+            clss = classes.values()
+        return {cls.__name__: self.count(cls) for cls in clss}
@@ -0,0 +1,201 @@
+#!/usr/bin/python3
+"""
+Contains the PlaceIndex class
+"""
+
+from itertools import compress
+import re
+import threading
+from models.city import City
+from models.place import Place
+
+# translation of the "0" and "1" of bin() to false and true bytes
+bit_values = bytes.maketrans(b"01", b"\x00\x01")
+# the bits set in each byte value, and a pattern finding non-zero bytes
+byte_bits = [[bit for bit in range(8) if value >> bit & 1]
+             for value in range(256)]
+nonzero_byte = re.compile(b"[^\x00]")
+
+
+class PlaceIndex:
+    """
+    keeps, for each city and amenity, the bitmap of the places it holds,
+    each place owning one bit of Python ints used as bitsets, so that
+    place searches are unions and intersections of ints
+    """
+
+    def __init__(self, storage):
+        """subscribes to storage, the index is built on the first search"""
+        self.__storage = storage
+        self.__lock = threading.Lock()
+        self.__built = False
+        storage.subscribe(self.update)
+
+    def __reset(self):
+        """empties the index"""
+        # place id -> bit, and bit -> place id (None for a free bit)
+        self.__bits = {}
+        self.__ids = []
+        self.__free = []
+        # bitmap of every place
+        self.__all = 0
+        # place id -> city id, and place id -> set of amenity ids
+        self.__city_of = {}
+        self.__amenities_of = {}
+        # city id -> bitmap, and amenity id -> bitmap
+        self.__by_city = {}
+        self.__by_amenity = {}
+        # city id -> state id, and state id -> set of city ids
+        self.__state_of = {}
+        self.__cities_of = {}
+        # state id -> bitmap, cached until the next update
+        self.__by_state = {}
+
+    def __build(self):
+        """indexes every city and place of the storage"""
+        self.__reset()
+        for city in self.__storage.all(City).values():
+            self.__set_city(city.id, city.state_id)
+        amenities = self.__storage.place_amenities()
+        for place in self.__storage.all(Place).values():
+            self.__set_place(place.id, place.city_id,
+                             amenities.get(place.id, []))
+        self.__built = True
+
+    def __set_city(self, city_id, state_id):
+        """records the state of a city"""
+        self.__drop_city(city_id)
+        self.__state_of[city_id] = state_id
+        self.__cities_of.setdefault(state_id, set()).add(city_id)
+
+    def __drop_city(self, city_id):
+        """forgets the state of a city, its places stay indexed by city"""
+        state_id = self.__state_of.pop(city_id, None)
+        cities = self.__cities_of.get(state_id, set())
+        cities.discard(city_id)
+        if not cities:
+            self.__cities_of.pop(state_id, None)
+
+    def __drop_state(self, state_id):
+        """forgets the cities of a state"""
+        for city_id in self.__cities_of.pop(state_id, set()):
+            self.__state_of.pop(city_id, None)
+
+    def __set_place(self, place_id, city_id, amenity_ids):
+        """gives a place a bit and sets it in its city and amenities"""
+        self.__drop_place(place_id)
+        if self.__free:
+            bit = self.__free.pop()
+        else:
+            bit = len(self.__ids)
+            self.__ids.append(None)
+        self.__bits[place_id] = bit
+        self.__ids[bit] = place_id
+        mask = 1 << bit
+        self.__all |= mask
+        self.__city_of[place_id] = city_id
+        self.__by_city[city_id] = self.__by_city.get(city_id, 0) | mask
+        self.__amenities_of[place_id] = set(amenity_ids)
+        for amenity_id in self.__amenities_of[place_id]:
+            bitmap = self.__by_amenity.get(amenity_id, 0)
+            self.__by_amenity[amenity_id] = bitmap | mask
+
+    def __drop_place(self, place_id):
+        """clears the bit of a place everywhere and frees it"""
+        bit = self.__bits.pop(place_id, None)
+        if bit is None:
+            return
+        mask = ~(1 << bit)
+        self.__all &= mask
+        city_id = self.__city_of.pop(place_id)
+        self.__by_city[city_id] &= mask
+        if not self.__by_city[city_id]:
+            del self.__by_city[city_id]
+        for amenity_id in self.__amenities_of.pop(place_id):
+            if amenity_id in self.__by_amenity:
+                self.__by_amenity[amenity_id] &= mask
+                if not self.__by_amenity[amenity_id]:
+                    del self.__by_amenity[amenity_id]
+        self.__ids[bit] = None
+        self.__free.append(bit)
+
+    def __state_bitmap(self, state_id):
+        """returns the bitmap of the places in the cities of a state"""
+        if state_id not in self.__by_state:
+            bitmap = 0
+            for city_id in self.__cities_of.get(state_id, ()):
+                bitmap |= self.__by_city.get(city_id, 0)
+            self.__by_state[state_id] = bitmap
+        return self.__by_state[state_id]
+
+    def __unpack(self, bitmap):
+        """
+        returns the place ids of the bits set in bitmap, walking only its
+        non-zero bytes when few bits are set
+        """
+        if bin(bitmap).count("1") * 64 > len(self.__ids):
+            bits = bin(bitmap)[:1:-1].encode().translate(bit_values)
+            return list(compress(self.__ids, bits))
+        ids = []
+        data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+        for match in nonzero_byte.finditer(data):
+            start = match.start() * 8
+            for bit in byte_bits[match.group()[0]]:
+                ids.append(self.__ids[start + bit])
+        return ids
+
+    def update(self, changes):
+        """
+        applies the objects saved by the storage, a dict of <class
+        name>.id to obj (None if deleted), or rebuilds if changes is None
+        """
+        with self.__lock:
+            if not self.__built:
+                return
+            if changes is None:
+                self.__built = False
+                return
+            self.__by_state = {}
+            places = {}
+            for key, obj in changes.items():
+                name, id = key.split(".", 1)
+                if name == "Place" and obj is None:
+                    self.__drop_place(id)
+                elif name == "Place":
+                    places[id] = obj
+                elif name == "City" and obj is None:
+                    self.__drop_city(id)
+                elif name == "City":
+                    self.__set_city(id, obj.state_id)
+                elif name == "State" and obj is None:
+                    self.__drop_state(id)
+                elif name == "Amenity" and obj is None:
+                    self.__by_amenity.pop(id, None)
+            if places:
+                amenities = self.__storage.place_amenities(list(places))
+                for id, place in places.items():
+                    self.__set_place(id, place.city_id,
+                                     amenities.get(id, []))
+
+    def search(self, states=None, cities=None, amenities=None):
+        """
+        Returns the ids of the places located in the given states or
+        cities (all places if there are none) that have every given
+        amenity
+        """
+        with self.__lock:
+            if not self.__built:
+                self.__build()
+            if states or cities:
+                found = 0
+                for state_id in set(states or []):
+                    found |= self.__state_bitmap(state_id)
+                for city_id in set(cities or []):
+                    found |= self.__by_city.get(city_id, 0)
+            else:
+                found = self.__all
+            for amenity_id in set(amenities or []):
+                if not found:
+                    break
+                found &= self.__by_amenity.get(amenity_id, 0)
+            return self.__unpack(found)
@@ -0,0 +1,25 @@
+#!/usr/bin/python3
+"""
+Compares the indexes the models declare with the ones of the database,
+printing the CREATE INDEX statements of the missing ones, and running
+them with --apply; the tables themselves are created by DBStorage.reload
+
+usage: HBNB_TYPE_STORAGE=db ./schema_diff.py [--apply]
+"""
+import sys
+from sqlalchemy.schema import CreateIndex
+
+if __name__ == "__main__":
+    import models
+
+    if models.storage_t != "db":
+        print("usage: HBNB_TYPE_STORAGE=db ./schema_diff.py [--apply]")
+        sys.exit(1)
+    indexes = models.storage.missing_indexes()
+    for index in indexes:
+        print(str(CreateIndex(index)).strip() + ";")
+    if "--apply" in sys.argv[1:]:
+        models.storage.create_indexes(indexes)
+        print("{} indexes created".format(len(indexes)))
+    elif not indexes:
+        print("no missing indexes")
@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+"""
+Contains the TestCacheDocs, TestLRUCache and TestResponseCache classes
+"""
+
+from api.v1 import cache
+from api.v1.app import app
+import inspect
+import models
+from models.state import State
+import pep8
+import time
+import unittest
+LRUCache = cache.LRUCache
+ResponseCache = cache.ResponseCache
+
+
+class TestCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the cache module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.cache_f = (inspect.getmembers(LRUCache, inspect.isfunction) +
+                       inspect.getmembers(ResponseCache, inspect.isfunction))
+
+    def test_pep8_conformance_cache(self):
+        """Test that api/v1/cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_cache(self):
+        """Test tests/test_api/test_v1/test_cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cache_module_docstring(self):
+        """Test for the cache.py module docstring"""
+        self.assertIsNot(cache.__doc__, None,
+                         "cache.py needs a docstring")
+        self.assertTrue(len(cache.__doc__) >= 1,
+                        "cache.py needs a docstring")
+
+    def test_cache_func_docstrings(self):
+        """Test for the presence of docstrings in the cache methods"""
+        for func in self.cache_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test the LRUCache backend"""
+    def test_evicts_least_recently_used(self):
+        """Test the least recently used key is evicted first"""
+        lru = LRUCache(2, 60)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+        self.assertEqual(lru.get("a"), 1)
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual(lru.evictions, 1)
+        self.assertEqual(len(lru), 2)
+
+    def test_expires(self):
+        """Test a value is gone once its ttl is over"""
+        lru = LRUCache(2, 0.01)
+        lru.set("a", 1)
+        time.sleep(0.02)
+        self.assertIsNone(lru.get("a"))
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test the caching of the responses of GET /api/v1/states"""
+    def setUp(self):
+        """Creates a test client and empties the response cache"""
+        self.client = app.test_client()
+        self.cache = cache.response_cache
+        self.cache.backend.clear()
+        self.max_bytes = self.cache.max_bytes
+
+    def tearDown(self):
+        """Restores the size limit of the response cache"""
+        self.cache.max_bytes = self.max_bytes
+
+    def get(self):
+        """gets the states, reading the whole streamed body"""
+        return self.client.get('/api/v1/states').get_data()
+
+    def test_miss_then_hit(self):
+        """Test a streamed list is cached once sent, then served"""
+        hits, misses = self.cache.hits, self.cache.misses
+        body = self.get()
+        self.assertEqual(self.cache.misses, misses + 1)
+        self.assertEqual(self.get(), body)
+        self.assertEqual(self.cache.hits, hits + 1)
+
+    def test_invalidated_on_save(self):
+        """Test saving a state stops serving the cached list"""
+        self.get()
+        state = State(name="Vecindad")
+        state.save()
+        hits = self.cache.hits
+        self.assertIn(state.id.encode(), self.get())
+        self.assertEqual(self.cache.hits, hits)
+        models.storage.delete(state)
+        models.storage.save()
+        self.assertNotIn(state.id.encode(), self.get())
+
+    def test_large_body_not_cached(self):
+        """Test a streamed body larger than max_bytes is not cached"""
+        self.cache.max_bytes = 1
+        hits = self.cache.hits
+        self.get()
+        self.get()
+        self.assertEqual(self.cache.hits, hits)
+
+    def test_stats(self):
+        """Test /stats/cache reports the metrics of the cache"""
+        self.get()
+        stats = self.client.get('/api/v1/stats/cache').get_json()
+        for key in ["hits", "misses", "hit_ratio", "invalidations",
+                    "evictions", "size"]:
+            self.assertIn(key, stats)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+"""
+Contains the TestBatchDocs and TestBatch classes
+"""
+
+from api.v1.app import app
+from api.v1.views import batch
+import inspect
+import models
+from models.state import State
+import pep8
+import unittest
+from unittest import mock
+
+
+class TestBatchDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the batch views"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.batch_f = inspect.getmembers(batch, inspect.isfunction)
+
+    def test_pep8_conformance_batch(self):
+        """Test that api/v1/views/batch.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/batch.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_batch(self):
+        """Test tests/test_api/test_v1/test_views/test_batch.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_batch.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_batch_module_docstring(self):
+        """Test for the batch.py module docstring"""
+        self.assertIsNot(batch.__doc__, None,
+                         "batch.py needs a docstring")
+        self.assertTrue(len(batch.__doc__) >= 1,
+                        "batch.py needs a docstring")
+
+    def test_batch_func_docstrings(self):
+        """Test for the presence of docstrings in batch functions"""
+        for func in self.batch_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestBatch(unittest.TestCase):
+    """Test the POST /<collection>/batch endpoint"""
+    def setUp(self):
+        """Creates a test client and a stored state"""
+        self.client = app.test_client()
+        self.state = State(name="Vecindad")
+        self.state.save()
+
+    def tearDown(self):
+        """Deletes the states the tests saved"""
+        for state in models.storage.all(State).values():
+            if state.name in ("Vecindad", "Mexico", "Chavo"):
+                models.storage.delete(state)
+        models.storage.save()
+
+    def post(self, operations):
+        """posts operations to /states/batch, returning the response"""
+        return self.client.post('/api/v1/states/batch', json=operations)
+
+    def test_operations(self):
+        """Test the results of a create, an update and invalid operations"""
+        response = self.post([
+            {"action": "create", "data": {"name": "Mexico"}},
+            {"action": "update",
+             "data": {"id": self.state.id, "name": "Chavo"}},
+            {"action": "create", "data": {}},
+            {"action": "delete", "data": {"id": "missing"}},
+            {"action": "rename"}])
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()
+        self.assertEqual([result["status"] for result in results],
+                         [201, 200, 400, 404, 400])
+        created = models.storage.get(State, results[0]["object"]["id"])
+        self.assertEqual(created.name, "Mexico")
+        self.assertEqual(models.storage.get(State, self.state.id).name,
+                         "Chavo")
+
+    def test_create_ignores_id(self):
+        """Test a create never replaces the object of the id it is given"""
+        response = self.post([{"action": "create",
+                               "data": {"id": self.state.id,
+                                        "name": "Mexico"}}])
+        result = response.get_json()[0]
+        self.assertEqual(result["status"], 201)
+        self.assertNotEqual(result["object"]["id"], self.state.id)
+        self.assertEqual(models.storage.get(State, self.state.id).name,
+                         "Vecindad")
+
+    def test_not_a_list(self):
+        """Test the body must be a JSON list and the collection known"""
+        self.assertEqual(self.post({"action": "create"}).status_code, 400)
+        response = self.client.post('/api/v1/planets/batch', json=[])
+        self.assertEqual(response.status_code, 404)
+
+    def test_failed_save(self):
+        """Test a failed save reports the valid operations as not saved"""
+        with mock.patch.object(models.storage, "save",
+                               side_effect=OSError), \
+                mock.patch.object(models.storage, "rollback") as rollback:
+            response = self.post([
+                {"action": "create", "data": {"name": "Mexico"}},
+                {"action": "create", "data": {}}])
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.get_json(),
+                         [{"status": 500, "error": "Not saved"},
+                          {"status": 400, "error": "Missing name"}])
+        rollback.assert_called_once_with()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_failed_save_rolls_back(self):
+        """Test the objects of a batch that failed to save are dropped"""
+        with mock.patch.object(models.storage, "save",
+                               side_effect=OSError):
+            response = self.post([
+                {"action": "create", "data": {"name": "Mexico"}},
+                {"action": "update",
+                 "data": {"id": self.state.id, "name": "Chavo"}}])
+        self.assertEqual(response.status_code, 500)
+        names = [state.name for state in models.storage.all(State).values()]
+        self.assertNotIn("Mexico", names)
+        self.assertNotIn("Chavo", names)
+        response = self.client.get('/api/v1/states/' + self.state.id)
+        self.assertEqual(response.get_json()["name"], "Vecindad")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+"""
+Contains the TestStreamingDocs and TestStreaming classes
+"""
+
+from api.v1.app import app
+from api.v1.views import streaming
+import inspect
+import json
+import models
+from models.state import State
+import pep8
+import unittest
+
+
+class TestStreamingDocs(unittest.TestCase):
+    """Tests to check the documentation and style of streaming.py"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.streaming_f = inspect.getmembers(streaming, inspect.isfunction)
+
+    def test_pep8_conformance_streaming(self):
+        """Test that api/v1/views/streaming.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/streaming.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_streaming(self):
+        """Test tests/test_api/test_v1/test_views/test_streaming.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_streaming.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_streaming_module_docstring(self):
+        """Test for the streaming.py module docstring"""
+        self.assertIsNot(streaming.__doc__, None,
+                         "streaming.py needs a docstring")
+        self.assertTrue(len(streaming.__doc__) >= 1,
+                        "streaming.py needs a docstring")
+
+    def test_streaming_func_docstrings(self):
+        """Test for the presence of docstrings in streaming functions"""
+        for func in self.streaming_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestStreaming(unittest.TestCase):
+    """Test the representations of the streamed GET /api/v1/states"""
+    @classmethod
+    def setUpClass(cls):
+        """Saves more states than fit in one chunk"""
+        cls.states = [State(name="State {}".format(i)) for i in range(300)]
+        models.storage.bulk_new(cls.states)
+        models.storage.save()
+        cls.ids = {state.id for state in cls.states}
+
+    @classmethod
+    def tearDownClass(cls):
+        """Deletes the saved states"""
+        for state in cls.states:
+            models.storage.delete(models.storage.get(State, state.id))
+        models.storage.save()
+
+    def get(self, path='/api/v1/states', **headers):
+        """gets path, returning the response and its text"""
+        response = app.test_client().get(path, headers=headers)
+        return response, response.get_data(as_text=True)
+
+    def test_json_array(self):
+        """Test the list is one JSON array by default"""
+        response, text = self.get()
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertTrue(text.startswith('[') and text.endswith(']\n'))
+        ids = {state['id'] for state in json.loads(text)}
+        self.assertTrue(self.ids <= ids)
+
+    def test_pretty_json_array(self):
+        """Test ?pretty=1 puts each object on its own lines"""
+        response, text = self.get('/api/v1/states?pretty=1')
+        self.assertTrue(text.startswith('[\n') and text.endswith('\n]\n'))
+        ids = {state['id'] for state in json.loads(text)}
+        self.assertTrue(self.ids <= ids)
+
+    def test_ndjson(self):
+        """Test the list is one JSON object per line for NDJSON clients"""
+        response, text = self.get(Accept='application/x-ndjson')
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertTrue(text.endswith('\n'))
+        lines = text.splitlines()
+        ids = {json.loads(line)['id'] for line in lines}
+        self.assertEqual(len(ids), len(lines))
+        self.assertTrue(self.ids <= ids)
+
+    def test_page(self):
+        """Test a limited page links to the next one"""
+        response, text = self.get('/api/v1/states?limit=2')
+        page = json.loads(text)
+        self.assertEqual(len(page), 2)
+        self.assertIn('after=' + page[-1]['id'], response.headers['Link'])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_db_page_is_lazy(self):
+        """Test an unlimited DBStorage page is read as it is iterated"""
+        self.assertNotIsInstance(models.storage.page(State), list)
+
+
+if __name__ == "__main__":
+    unittest.main()
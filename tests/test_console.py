@@ -1,11 +1,17 @@
 #!/usr/bin/python3
 """
-Contains the class TestConsoleDocs
+Contains the TestConsoleDocs and TestConsoleBulk classes
 """
 
 import console
+import contextlib
 import inspect
+import io
+import models
+from models.state import State
+import os
 import pep8
+import tempfile
 import unittest
 HBNBCommand = console.HBNBCommand
 
@@ -39,3 +45,44 @@ class TestConsoleDocs(unittest.TestCase):
                          "HBNBCommand class needs a docstring")
         self.assertTrue(len(HBNBCommand.__doc__) >= 1,
                         "HBNBCommand class needs a docstring")
+
+
+class TestConsoleBulk(unittest.TestCase):
+    """Test the errors reported by the import and export commands"""
+    def setUp(self):
+        """Creates a temporary directory for the files"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "states.ndjson")
+
+    def tearDown(self):
+        """Removes the temporary directory"""
+        self.tmp.cleanup()
+
+    def run_command(self, line):
+        """runs line in the console, returning what it printed"""
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            HBNBCommand().onecmd(line)
+        return out.getvalue()
+
+    def test_import_missing_file(self):
+        """Test importing a missing file reports it"""
+        self.assertEqual(self.run_command("import " + self.path),
+                         "** file doesn't exist **\n")
+
+    def test_import_invalid_record(self):
+        """Test a bad record is reported and nothing is imported"""
+        count = models.storage.count(State)
+        for text, cls in [('{"name": "Vecindad"}\n{"name": ', " State"),
+                          ('{"__class__": "Planet"}', "")]:
+            with open(self.path, "w") as f:
+                f.write(text)
+            self.assertEqual(self.run_command("import " + self.path + cls),
+                             "** invalid record **\n")
+        self.assertEqual(models.storage.count(State), count)
+
+    def test_export_unwritable_file(self):
+        """Test exporting to a file that can't be written reports it"""
+        path = os.path.join(self.tmp.name, "missing", "states.ndjson")
+        self.assertEqual(self.run_command("export {} State".format(path)),
+                         "** can't write file **\n")
@@ -0,0 +1,145 @@
+#!/usr/bin/python3
+"""
+Contains the TestBulkDocs and TestBulk classes
+"""
+
+import contextlib
+import inspect
+import io
+import json
+import models
+import os
+from models.engine import bulk
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+import unittest
+
+
+class TestBulkDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the bulk module"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.bulk_f = inspect.getmembers(bulk, inspect.isfunction)
+
+    def test_pep8_conformance_bulk(self):
+        """Test that models/engine/bulk.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/bulk.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_bulk(self):
+        """Test tests/test_models/test_bulk.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_bulk.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_bulk_module_docstring(self):
+        """Test for the bulk.py module docstring"""
+        self.assertIsNot(bulk.__doc__, None,
+                         "bulk.py needs a docstring")
+        self.assertTrue(len(bulk.__doc__) >= 1,
+                        "bulk.py needs a docstring")
+
+    def test_bulk_func_docstrings(self):
+        """Test for the presence of docstrings in bulk functions"""
+        for func in self.bulk_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestBulk(unittest.TestCase):
+    """Test the bulk loader and exporter"""
+    def test_load_ndjson(self):
+        """Test load creates the objects of NDJSON records"""
+        state = State(name="Vecindad")
+        lines = [json.dumps(state.to_dict()),
+                 json.dumps({"name": "Mexico"})]
+        f = io.StringIO("\n".join(lines) + "\n")
+        count, seconds = bulk.load(bulk.read(f, "ndjson", State))
+        self.assertEqual(count, 2)
+        loaded = models.storage.get(State, state.id)
+        self.assertEqual(loaded.name, "Vecindad")
+        self.assertEqual(loaded.created_at, state.created_at)
+
+    def test_password_round_trip(self):
+        """Test an exported and imported user keeps its password hash"""
+        user = User(email="a@b.c", password="pwd")
+        models.storage.new(user)
+        models.storage.save()
+        password = user.password
+        f = io.StringIO()
+        bulk.export(f, "ndjson", [User])
+        models.storage.delete(user)
+        models.storage.save()
+        f.seek(0)
+        bulk.load(record for record in bulk.read(f, "ndjson")
+                  if record["id"] == user.id)
+        self.assertEqual(models.storage.get(User, user.id).password,
+                         password)
+
+    def test_insert_keeps_password(self):
+        """Test a user migrated by insert keeps its password column"""
+        user = User(email="a@b.c", password="pwd")
+        record = user.to_dict(save_fs=1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            bulk.insert([record], 10)
+        self.assertEqual(models.storage.get(User, user.id).password,
+                         record["password"])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_csv_round_trip(self):
+        """Test objects exported to CSV read back with their types"""
+        place = Place(name="Casa", city_id="c", user_id="u",
+                      number_rooms=3, latitude=1.5, amenity_ids=["a", "b"])
+        models.storage.new(place)
+        f = io.StringIO()
+        count, seconds = bulk.export(f, "csv", [Place])
+        models.storage.delete(place)
+        self.assertEqual(count, models.storage.count(Place) + 1)
+        f.seek(0)
+        records = {record["id"]: record for record in bulk.read(f, "csv")}
+        self.assertEqual(records[place.id]["__class__"], "Place")
+        self.assertEqual(records[place.id]["name"], "Casa")
+        self.assertEqual(records[place.id]["number_rooms"], 3)
+        self.assertEqual(records[place.id]["latitude"], 1.5)
+        self.assertEqual(records[place.id]["amenity_ids"], ["a", "b"])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_insert_compacts_after_background(self):
+        """Test insert of more records than trigger a compaction"""
+        journal = FileStorage._FileStorage__journal
+        every = FileStorage._FileStorage__compact_every
+        FileStorage._FileStorage__journal = True
+        FileStorage._FileStorage__compact_every = 50
+        states = [State(name="State {}".format(i)) for i in range(500)]
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                bulk.insert([state.to_dict(save_fs=1) for state in states],
+                            10)
+            self.assertFalse(os.path.exists("file.json.log"))
+            self.assertFalse(os.path.exists("file.json.log.1"))
+            with open("file.json", "r") as f:
+                saved = json.load(f)
+            for state in states:
+                self.assertIn("State." + state.id, saved)
+            self.assertEqual([name for name in os.listdir(".")
+                              if name.endswith(".tmp")], [])
+        finally:
+            FileStorage._FileStorage__journal = journal
+            FileStorage._FileStorage__compact_every = every
+        for state in states:
+            models.storage.delete(models.storage.get(State, state.id))
+        models.storage.save()
+
+
+if __name__ == "__main__":
+    unittest.main()
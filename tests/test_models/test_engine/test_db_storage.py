@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """
-Contains the TestDBStorageDocs and TestDBStorage classes
+Contains the TestDBStorageDocs, TestDBStorage, TestPoolStats and
+TestReplicas classes
 """
 
 from datetime import datetime
@@ -17,6 +18,9 @@ from models.user import User
 import json
 import os
 import pep8
+import sqlalchemy
+import sqlite3
+import tempfile
 import unittest
 from models import storage
 DBStorage = db_storage.DBStorage
@@ -108,3 +112,170 @@ class TestFileStorage(unittest.TestCase):
         storage.save()
         c = storage.count()
         self.assertEqual(len(storage.all()), c)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_counts(self):
+        """ Tests that counts matches count for every class """
+        counts = storage.counts()
+        for name, cls in classes.items():
+            with self.subTest(name=name):
+                self.assertEqual(counts[name], storage.count(cls))
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_get_many(self):
+        """ Tests that get_many returns found objects in ids order """
+        first = State(name="Cundinamarca")
+        second = State(name="Antioquia")
+        storage.new(first)
+        storage.new(second)
+        storage.save()
+        objs = storage.get_many(State, [second.id, "missing", first.id])
+        self.assertEqual(objs, [second, first])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_page(self):
+        """ Tests that page walks the objects of a class in id order """
+        state = State(name="Vecindad")
+        storage.new(state)
+        cities = [City(name="Chavo", state_id=state.id) for i in range(5)]
+        for city in cities:
+            storage.new(city)
+        storage.save()
+        ids = sorted(city.id for city in cities)
+        page = storage.page(City, 2, None, "state_id", state.id)
+        self.assertEqual([city.id for city in page], ids[:2])
+        page = storage.page(City, 2, ids[1], "state_id", state.id)
+        self.assertEqual([city.id for city in page], ids[2:4])
+        page = storage.page(City, None, ids[3], "state_id", state.id)
+        self.assertEqual([city.id for city in page], ids[4:])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_version(self):
+        """ Tests that version changes with the saves of a class only """
+        states, cities = storage.version(State), storage.version(City)
+        state = State(name="Vecindad")
+        state.save()
+        self.assertNotEqual(storage.version(State), states)
+        self.assertEqual(storage.version(City), cities)
+        states = storage.version(State)
+        state.name = "Mexico"
+        state.save()
+        self.assertNotEqual(storage.version(State), states)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_search_places(self):
+        """ Tests search_places filters by state and pages in id order """
+        state = State(name="Vecindad")
+        state.save()
+        city = City(name="Chavo", state_id=state.id)
+        city.save()
+        user = User(email="a@b.c", password="pwd")
+        user.save()
+        places = [Place(name="Casa", city_id=city.id, user_id=user.id)
+                  for i in range(3)]
+        for place in places:
+            place.save()
+        ids = sorted(place.id for place in places)
+        found = storage.search_places(states=[state.id])
+        self.assertCountEqual([place.id for place in found], ids)
+        found = storage.search_places([state.id], None, None, 2, ids[0])
+        self.assertEqual([place.id for place in found], ids[1:])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_save_reports_autoflushed(self):
+        """ Tests save reports the changes a query autoflushed before it """
+        saved = []
+        storage.subscribe(saved.append)
+        first = State(name="Vecindad")
+        storage.new(first)
+        storage.count(State)
+        second = State(name="Mexico")
+        storage.new(second)
+        storage.save()
+        self.assertIn("State." + first.id, saved[-1])
+        self.assertIn("State." + second.id, saved[-1])
+        storage._DBStorage__listeners.remove(saved.append)
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_pool_stats(self):
+        """ Tests pool_stats reports the connections of the pool """
+        stats = storage.pool_stats()
+        for key in ["size", "checkedin", "checkedout", "overflow",
+                    "waits", "wait_time", "timeouts"]:
+            self.assertIn(key, stats)
+        self.assertLessEqual(stats["checkedout"],
+                             stats["size"] + stats["overflow"])
+
+    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+    def test_missing_indexes(self):
+        """ Tests the indexes of the models are created by reload """
+        self.assertEqual(storage.missing_indexes(), [])
+        names = [index.name for index in State.__table__.indexes]
+        self.assertIn("ix_states_name", names)
+
+
+class TestPoolStats(unittest.TestCase):
+    """Test the counting of the checkouts that waited for a connection"""
+    def setUp(self):
+        """Creates a pool of one sqlite connection"""
+        self.pool = db_storage.WaitCountingQueuePool(
+            lambda: sqlite3.connect(":memory:"), pool_size=1,
+            max_overflow=0, timeout=0.05)
+
+    def tearDown(self):
+        """Closes the connections of the pool"""
+        self.pool.dispose()
+
+    def test_waits(self):
+        """Test only a checkout finding every connection in use waits"""
+        connection = self.pool.connect()
+        with self.assertRaises(sqlalchemy.exc.TimeoutError):
+            self.pool.connect()
+        connection.close()
+        self.pool.connect().close()
+        stats = db_storage.pool_counters(self.pool)
+        self.assertEqual(stats["waits"], 1)
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertGreaterEqual(stats["wait_time"], 0.05)
+        self.assertEqual(stats["checkedout"], 0)
+        self.assertEqual(self.pool.stats.in_use, 0)
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestReplicas(unittest.TestCase):
+    """Test the routing of reads to the replicas, on sqlite files"""
+    def setUp(self):
+        """Creates a primary and two replicas, the second one down"""
+        path = tempfile.mkdtemp()
+        self.primary = db_storage.create_engine(
+            "sqlite:///" + os.path.join(path, "primary.db"))
+        self.replicas = db_storage.Replicas(
+            ["sqlite:///" + os.path.join(path, "replica.db"),
+             "sqlite:///" + os.path.join(path, "down", "replica.db")])
+        for engine in [self.primary, self.replicas.engines[0]]:
+            models.base_model.Base.metadata.create_all(engine)
+        self.session = db_storage.sessionmaker(
+            bind=self.primary, class_=db_storage.RoutingSession,
+            replicas=self.replicas, expire_on_commit=False)
+
+    def test_next_skips_unhealthy(self):
+        """Test next hands out the healthy replicas only"""
+        healthy = self.replicas.engines[0]
+        self.assertIs(self.replicas.next(), healthy)
+        self.assertIs(self.replicas.next(), healthy)
+        stats = self.replicas.stats()
+        self.assertEqual([replica["healthy"] for replica in stats],
+                         [True, False])
+
+    def test_read_your_writes(self):
+        """Test a session reads from the primary once it wrote"""
+        session = self.session()
+        self.assertIs(session.get_bind(), self.replicas.engines[0])
+        session.add(State(name="California"))
+        self.assertEqual(session.query(State).count(), 1)
+        self.assertIs(session.get_bind(), self.primary)
+        session.commit()
+        session.close()
+        session = self.session()
+        self.assertEqual(session.query(State).count(), 0)
+        session.close()
@@ -139,3 +139,288 @@ class TestFileStorage(unittest.TestCase):
         storage.save()
         c = storage.count()
         self.assertEqual(len(storage.all()), c)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_cls_follows_new_and_delete(self):
+        """Test that all(cls) reflects objects added and removed"""
+        storage = FileStorage()
+        state = State(name="Vecindad")
+        storage.new(state)
+        key = "State." + state.id
+        self.assertIs(storage.all(State)[key], state)
+        self.assertIs(storage.all("State")[key], state)
+        self.assertNotIn(key, storage.all(City))
+        storage.delete(state)
+        self.assertNotIn(key, storage.all(State))
+        self.assertIsNone(storage.get(State, state.id))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_counts(self):
+        """ Tests that counts matches count for every class """
+        storage = FileStorage()
+        storage.new(State(name="Vecindad"))
+        counts = storage.counts()
+        for name, cls in classes.items():
+            with self.subTest(name=name):
+                self.assertEqual(counts[name], storage.count(cls))
+                self.assertEqual(counts[name], len(storage.all(cls)))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_many(self):
+        """ Tests that get_many returns found objects in ids order """
+        storage = FileStorage()
+        first = State(name="Vecindad")
+        second = State(name="Mexico")
+        storage.new(first)
+        storage.new(second)
+        objs = storage.get_many(State, [second.id, "missing", first.id])
+        self.assertEqual(objs, [second, first])
+        self.assertEqual(storage.get_many(City, [first.id]), [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_journal(self):
+        """Test that journaled saves are replayed and compacted"""
+        storage = FileStorage()
+        storage.save()
+        journal = FileStorage._FileStorage__journal
+        FileStorage._FileStorage__journal = True
+        try:
+            kept = State(name="Vecindad")
+            gone = State(name="Mexico")
+            storage.new(kept)
+            storage.new(gone)
+            storage.save()
+            storage.delete(gone)
+            storage.save()
+            self.assertTrue(os.path.exists("file.json.log"))
+            with open("file.json", "r") as f:
+                self.assertNotIn("State." + kept.id, json.load(f))
+            save = FileStorage._FileStorage__objects
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertIsNotNone(storage.get(State, kept.id))
+            self.assertIsNone(storage.get(State, gone.id))
+            storage.compact()
+            self.assertFalse(os.path.exists("file.json.log"))
+            with open("file.json", "r") as f:
+                self.assertIn("State." + kept.id, json.load(f))
+            FileStorage._FileStorage__objects = save
+        finally:
+            FileStorage._FileStorage__journal = journal
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_compact_while_compacting(self):
+        """Test that a compaction waits for the one in the background"""
+        storage = FileStorage()
+        storage.save()
+        journal = FileStorage._FileStorage__journal
+        every = FileStorage._FileStorage__compact_every
+        FileStorage._FileStorage__journal = True
+        FileStorage._FileStorage__compact_every = 100
+        try:
+            states = []
+            for i in range(500):
+                states.append(State(name="State {}".format(i)))
+                storage.new(states[-1])
+                storage.save()
+            storage.compact()
+            self.assertFalse(os.path.exists("file.json.log"))
+            self.assertFalse(os.path.exists("file.json.log.1"))
+            with open("file.json", "r") as f:
+                saved = json.load(f)
+            for state in states:
+                self.assertIn("State." + state.id, saved)
+        finally:
+            FileStorage._FileStorage__journal = journal
+            FileStorage._FileStorage__compact_every = every
+        for state in states:
+            storage.delete(state)
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_keeps_password(self):
+        """Test that reload reads back the password hash as saved"""
+        storage = FileStorage()
+        user = User(email="a@b.c", password="pwd")
+        storage.new(user)
+        storage.save()
+        password = user.password
+        storage.reload()
+        self.assertEqual(storage.get(User, user.id).password, password)
+        storage.delete(storage.get(User, user.id))
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_rollback(self):
+        """Test that rollback discards the changes made since save()"""
+        storage = FileStorage()
+        kept = State(name="Vecindad")
+        storage.new(kept)
+        storage.save()
+        added = State(name="Mexico")
+        storage.new(added)
+        storage.get(State, kept.id).name = "Chavo"
+        storage.rollback()
+        self.assertIsNone(storage.get(State, added.id))
+        self.assertEqual(storage.get(State, kept.id).name, "Vecindad")
+        storage.save()
+        storage.rollback()
+        self.assertIsNone(storage.get(State, added.id))
+        storage.delete(storage.get(State, kept.id))
+        storage.save()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_setattr_marks_dirty(self):
+        """Test that setting an attribute flags only stored objects"""
+        storage = FileStorage()
+        storage.save()
+        dirty = FileStorage._FileStorage__dirty
+        state = State(name="Vecindad")
+        self.assertNotIn("State." + state.id, dirty)
+        storage.new(state)
+        dirty.clear()
+        state.name = "Mexico"
+        self.assertIn("State." + state.id, FileStorage._FileStorage__dirty)
+        storage.save()
+        self.assertEqual(FileStorage._FileStorage__dirty, set())
+        self.assertNotIn("_stored", state.to_dict())
+        storage.delete(state)
+        storage.save()
+        state.name = "Vecindad"
+        self.assertEqual(FileStorage._FileStorage__dirty, set())
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_reloads_only_on_change(self):
+        """Test that close() reloads only when file.json changed on disk"""
+        storage = FileStorage()
+        state = State(name="Vecindad")
+        storage.new(state)
+        storage.save()
+        storage.close()
+        self.assertIs(storage.get(State, state.id), state)
+        with open("file.json", "r") as f:
+            js = json.load(f)
+        js["State." + state.id]["name"] = "Mexico"
+        with open("file.json", "w") as f:
+            json.dump(js, f)
+            f.write(" ")
+        storage.close()
+        self.assertIsNot(storage.get(State, state.id), state)
+        self.assertEqual(storage.get(State, state.id).name, "Mexico")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_jsonl_format(self):
+        """Test that the JSON Lines format writes one object per line"""
+        storage = FileStorage()
+        state = State(name="Vecindad")
+        storage.new(state)
+        fmt = FileStorage._FileStorage__format
+        path = FileStorage._FileStorage__file_path
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__format = "jsonl"
+        FileStorage._FileStorage__file_path = "file.jsonl"
+        try:
+            storage.save()
+            with open("file.jsonl", "r") as f:
+                lines = [json.loads(line) for line in f]
+            self.assertEqual(len(lines), len(storage.all()))
+            self.assertIn(state.to_dict(save_fs=1), lines)
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(storage.get(State, state.id).name, "Vecindad")
+        finally:
+            FileStorage._FileStorage__format = fmt
+            FileStorage._FileStorage__file_path = path
+            FileStorage._FileStorage__objects = save
+            os.remove("file.jsonl")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_sharded_layout(self):
+        """Test that a sharded layout loads each class on first use"""
+        storage = FileStorage()
+        state = State(name="Vecindad")
+        city = City(name="Mexico")
+        sharded = FileStorage._FileStorage__sharded
+        save = FileStorage._FileStorage__objects
+        FileStorage._FileStorage__sharded = True
+        try:
+            storage.reload()
+            storage.new(state)
+            storage.new(city)
+            storage.save()
+            self.assertTrue(os.path.exists("file.State.json"))
+            self.assertTrue(os.path.exists("file.City.json"))
+            FileStorage._FileStorage__objects = {}
+            storage.reload()
+            self.assertEqual(storage._FileStorage__objects, {})
+            self.assertEqual(storage.get(State, state.id).name, "Vecindad")
+            self.assertNotIn("City." + city.id, storage._FileStorage__objects)
+            self.assertIn("City." + city.id, storage.all(City))
+        finally:
+            FileStorage._FileStorage__sharded = sharded
+            FileStorage._FileStorage__objects = save
+            for name in classes:
+                if os.path.exists("file.{}.json".format(name)):
+                    os.remove("file.{}.json".format(name))
+            storage.reload()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_by_follows_foreign_keys(self):
+        """Test that all_by tracks foreign keys through new, set and delete"""
+        storage = FileStorage()
+        first = State(name="Vecindad")
+        second = State(name="Mexico")
+        city = City(name="Chavo", state_id=first.id)
+        key = "City." + city.id
+        storage.new(first)
+        storage.new(second)
+        storage.new(city)
+        self.assertEqual(list(storage.all_by(City, "state_id", first.id)),
+                         [key])
+        self.assertEqual(first.cities, [city])
+        city.state_id = second.id
+        self.assertEqual(storage.all_by(City, "state_id", first.id), {})
+        self.assertEqual(second.cities, [city])
+        self.assertIs(storage.all_by(City, "name", "Chavo")[key], city)
+        storage.delete(city)
+        self.assertEqual(second.cities, [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_page(self):
+        """Test page walks the objects of a class in id order"""
+        storage = FileStorage()
+        state = State(name="Vecindad")
+        cities = [City(name="Chavo", state_id=state.id) for i in range(5)]
+        for obj in [state] + cities:
+            storage.new(obj)
+        ids = sorted(city.id for city in cities)
+        page = storage.page(City, 2, None, "state_id", state.id)
+        self.assertEqual([city.id for city in page], ids[:2])
+        page = storage.page(City, 2, ids[1], "state_id", state.id)
+        self.assertEqual([city.id for city in page], ids[2:4])
+        page = storage.page(City, None, ids[3], "state_id", state.id)
+        self.assertEqual([city.id for city in page], ids[4:])
+        all_ids = sorted(storage.all(City))
+        self.assertEqual(["City." + city.id for city in storage.page(City, 3)],
+                         all_ids[:3])
+        storage.delete(storage.all(City)[all_ids[1]])
+        page = storage.page(City, 2, all_ids[0][5:])
+        self.assertEqual(["City." + city.id for city in page], all_ids[2:4])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_version(self):
+        """Test version changes with the saves of a class only"""
+        storage = FileStorage()
+        state = State(name="Vecindad")
+        storage.new(state)
+        storage.save()
+        states, cities = storage.version(State), storage.version(City)
+        self.assertNotEqual(states, cities)
+        state.name = "Mexico"
+        storage.save()
+        self.assertNotEqual(storage.version(State), states)
+        self.assertEqual(storage.version(City), cities)
+        states = storage.version(State)
+        storage.reload()
+        self.assertNotEqual(storage.version(State), states)
@@ -0,0 +1,93 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlaceIndexDocs and TestPlaceIndex classes
+"""
+
+import inspect
+import models
+from models.engine import place_index
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+import pep8
+import unittest
+PlaceIndex = place_index.PlaceIndex
+
+
+class TestPlaceIndexDocs(unittest.TestCase):
+    """Tests to check the documentation and style of PlaceIndex class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.pi_f = inspect.getmembers(PlaceIndex, inspect.isfunction)
+
+    def test_pep8_conformance_place_index(self):
+        """Test that models/engine/place_index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/place_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_place_index(self):
+        """Test tests/test_models/test_place_index.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_place_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_place_index_module_docstring(self):
+        """Test for the place_index.py module docstring"""
+        self.assertIsNot(place_index.__doc__, None,
+                         "place_index.py needs a docstring")
+        self.assertTrue(len(place_index.__doc__) >= 1,
+                        "place_index.py needs a docstring")
+
+    def test_place_index_class_docstring(self):
+        """Test for the PlaceIndex class docstring"""
+        self.assertIsNot(PlaceIndex.__doc__, None,
+                         "PlaceIndex class needs a docstring")
+        self.assertTrue(len(PlaceIndex.__doc__) >= 1,
+                        "PlaceIndex class needs a docstring")
+
+    def test_pi_func_docstrings(self):
+        """Test for the presence of docstrings in PlaceIndex methods"""
+        for func in self.pi_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestPlaceIndex(unittest.TestCase):
+    """Test the PlaceIndex class"""
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_search_follows_saves(self):
+        """Test that searches reflect the objects saved to the storage"""
+        storage = models.storage
+        index = PlaceIndex(storage)
+        state = State(name="Vecindad")
+        city = City(name="Chavo", state_id=state.id)
+        wifi = Amenity(name="Wifi")
+        place = Place(name="Barril", city_id=city.id, amenity_ids=[wifi.id])
+        for obj in [state, city, wifi, place]:
+            storage.new(obj)
+        storage.save()
+        self.assertEqual(index.search(states=[state.id]), [place.id])
+        self.assertEqual(index.search(cities=[city.id],
+                                      amenities=[wifi.id]), [place.id])
+        self.assertIn(place.id, index.search())
+        self.assertEqual(index.search(amenities=["missing"]), [])
+        other = Place(name="Casa", city_id=city.id)
+        storage.new(other)
+        place.amenity_ids = []
+        storage.save()
+        self.assertCountEqual(index.search(states=[state.id]),
+                              [place.id, other.id])
+        self.assertEqual(index.search(amenities=[wifi.id]), [])
+        storage.delete(other)
+        storage.delete(state)
+        storage.save()
+        self.assertEqual(index.search(states=[state.id]), [])
+        self.assertEqual(index.search(cities=[city.id]), [place.id])
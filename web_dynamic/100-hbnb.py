@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 """ Starts a Flash Web Application """
 from models import storage
+from api.v1.compression import enable_compression, serve_precompressed
 from models.state import State
 from models.city import City
 from models.amenity import Amenity
@@ -9,6 +10,8 @@ from os import environ
 from flask import Flask, render_template
 import uuid
 app = Flask(__name__)
+enable_compression(app)
+serve_precompressed(app)
 # app.jinja_env.trim_blocks = True
 # app.jinja_env.lstrip_blocks = True
 
@@ -0,0 +1,43 @@
+#!/usr/bin/python3
+"""
+Writes next to each text file of web_dynamic/static its .gz variant, and
+its .br variant when brotli is installed, for serve_precompressed() to
+send instead of compressing on every request; run it at deploy time, the
+variants being left out of git
+
+usage: python3 -m web_dynamic.compress_static
+"""
+import gzip
+import os
+from api.v1.compression import brotli
+
+extensions = ('.css', '.js', '.html', '.svg', '.json', '.txt')
+static = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+
+def write(path, data):
+    """writes data to path if it holds anything else"""
+    if os.path.isfile(path):
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+if __name__ == "__main__":
+    for root, dirs, files in os.walk(static):
+        for name in sorted(files):
+            if not name.endswith(extensions):
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'rb') as f:
+                data = f.read()
+            variants = [('.gz', gzip.compress(data, 9, mtime=0))]
+            if brotli is not None:
+                variants.append(('.br', brotli.compress(data, quality=11)))
+            for suffix, compressed in variants:
+                write(path + suffix, compressed)
+                print("{} {} -> {} bytes".format(
+                    os.path.relpath(path + suffix, static), len(data),
+                    len(compressed)))